@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Report the byte cost of every bundled asset against a budget and produce
+cheaper variants where they qualify.
+
+Images get a lossless WebP and, if they use at most 256 colors, a palette PNG.
+WAVs get a 22.05 kHz and a mono variant. A variant qualifies when it is
+smaller than the original; the report lists the bytes saved next to the
+decode time of the original and of the variant so both sides are visible.
+
+Usage: python3 analyze_assets.py [--budget KB] [--budget-for GLOB=KB ...]
+                                 [--variants DIR] [--no-variants]
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import io
+import os
+import time
+
+import numpy as np
+from PIL import Image
+from scipy.io import wavfile
+from scipy.signal import resample_poly
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".webp")
+AUDIO_EXTS = (".wav",)
+DEFAULT_BUDGET_KB = 100
+DECODE_RUNS = 5
+
+
+def find_assets():
+    """Bundled assets plus the store screenshots next to the generators."""
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(os.path.join(ROOT, "assets")):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        for name in filenames:
+            if name.lower().endswith(IMAGE_EXTS + AUDIO_EXTS):
+                paths.append(os.path.join(dirpath, name))
+    for name in os.listdir(ROOT):
+        if name.startswith("screenshot_") and name.endswith(".png"):
+            paths.append(os.path.join(ROOT, name))
+    return sorted(paths)
+
+
+def budget_for(relpath, default_kb, overrides):
+    for pattern, kb in overrides:
+        if fnmatch.fnmatch(relpath, pattern):
+            return kb * 1024
+    return default_kb * 1024
+
+
+def time_decode(data, decode):
+    """Median wall time in ms to fully decode `data`."""
+    samples = []
+    for _ in range(DECODE_RUNS):
+        t0 = time.perf_counter()
+        decode(data)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return sorted(samples)[len(samples) // 2]
+
+
+def decode_image(data):
+    with Image.open(io.BytesIO(data)) as im:
+        im.load()
+
+
+def decode_wav(data):
+    wavfile.read(io.BytesIO(data))
+
+
+# ── Variant builders: each returns encoded bytes or None if not applicable ──
+
+def webp_lossless(im):
+    buf = io.BytesIO()
+    im.save(buf, "WEBP", lossless=True, method=6)
+    return buf.getvalue()
+
+
+def palette_png(im):
+    # Only lossless palettes qualify: getcolors() returns None above 256 colors
+    if im.getcolors(256) is None:
+        return None
+    mode = "RGBA" if "A" in im.getbands() else "RGB"
+    pal = im.convert(mode).quantize(256, method=Image.Quantize.FASTOCTREE if mode == "RGBA"
+                                    else Image.Quantize.MEDIANCUT)
+    buf = io.BytesIO()
+    pal.save(buf, "PNG", optimize=True)
+    return buf.getvalue()
+
+
+def wav_downsampled(rate, data):
+    if rate <= 22050:
+        return None
+    out = resample_poly(data.astype(np.float64), 22050, rate, axis=0)
+    if np.issubdtype(data.dtype, np.integer):
+        info = np.iinfo(data.dtype)
+        out = np.clip(np.round(out), info.min, info.max)
+    buf = io.BytesIO()
+    wavfile.write(buf, 22050, out.astype(data.dtype))
+    return buf.getvalue()
+
+
+def wav_mono(rate, data):
+    if data.ndim == 1:
+        return None
+    buf = io.BytesIO()
+    wavfile.write(buf, rate, data.mean(axis=1).astype(data.dtype))
+    return buf.getvalue()
+
+
+IMAGE_VARIANTS = [("webp", ".webp", webp_lossless), ("palette", ".png", palette_png)]
+AUDIO_VARIANTS = [("22k", ".wav", wav_downsampled), ("mono", ".wav", wav_mono)]
+
+
+def analyze(path, budget):
+    with open(path, "rb") as f:
+        data = f.read()
+    is_image = path.lower().endswith(IMAGE_EXTS)
+    decode = decode_image if is_image else decode_wav
+    row = {
+        "path": path,
+        "bytes": len(data),
+        "budget": budget,
+        "sha1": hashlib.sha1(data).hexdigest(),
+        "decode_ms": time_decode(data, decode),
+        "variants": [],
+    }
+    if is_image:
+        with Image.open(io.BytesIO(data)) as im:
+            im.load()
+            candidates = [(tag, ext, build(im)) for tag, ext, build in IMAGE_VARIANTS]
+    else:
+        rate, samples = wavfile.read(io.BytesIO(data))
+        candidates = [(tag, ext, build(rate, samples)) for tag, ext, build in AUDIO_VARIANTS]
+    for tag, ext, encoded in candidates:
+        if encoded is None or len(encoded) >= len(data):
+            continue
+        row["variants"].append({
+            "tag": tag,
+            "ext": ext,
+            "data": encoded,
+            "bytes": len(encoded),
+            "decode_ms": time_decode(encoded, decode),
+        })
+    row["variants"].sort(key=lambda v: v["bytes"])
+    return row
+
+
+def write_variants(rows, out_dir):
+    for row in rows:
+        rel = os.path.relpath(row["path"], ROOT)
+        stem = os.path.splitext(rel)[0]
+        for v in row["variants"]:
+            dest = os.path.join(out_dir, f"{stem}.{v['tag']}{v['ext']}")
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            with open(dest, "wb") as f:
+                f.write(v["data"])
+
+
+def kb(n):
+    return f"{n / 1024:8.1f}"
+
+
+def print_report(rows):
+    print(f"{'asset':<36} {'KB':>8} {'budget':>8}  {'decode':>8}  best variant")
+    total = saved = duplicated = 0
+    over = 0
+    seen = {}
+    for row in rows:
+        rel = os.path.relpath(row["path"], ROOT)
+        total += row["bytes"]
+        flag = "OVER" if row["bytes"] > row["budget"] else "ok"
+        over += flag == "OVER"
+        dup = seen.setdefault(row["sha1"], rel)
+        best = ""
+        if row["variants"]:
+            v = row["variants"][0]
+            delta = row["bytes"] - v["bytes"]
+            if dup == rel:  # a duplicate group's variant saving is counted once
+                saved += delta
+            best = (f"{v['tag']:<8} -{kb(delta).strip()} KB "
+                    f"({100 * delta / row['bytes']:.0f}%), decode "
+                    f"{row['decode_ms']:.1f} -> {v['decode_ms']:.1f} ms")
+        if dup != rel:
+            duplicated += row["bytes"]
+            best = f"duplicate of {dup}" + (f"; {best}" if best else "")
+        print(f"{rel:<36} {kb(row['bytes'])} {kb(row['budget'])}  "
+              f"{row['decode_ms']:6.1f}ms  {flag:<4} {best}")
+    print(f"\n{len(rows)} assets, {kb(total).strip()} KB total, {over} over budget, "
+          f"{kb(saved).strip()} KB saveable with the best variants, "
+          f"{kb(duplicated).strip()} KB in duplicates")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Asset byte-budget analyzer")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_KB,
+                        help=f"default per-asset budget in KB (default {DEFAULT_BUDGET_KB})")
+    parser.add_argument("--budget-for", action="append", default=[], metavar="GLOB=KB",
+                        help="per-pattern budget, e.g. 'assets/sounds/*=40' (first match wins)")
+    parser.add_argument("--variants", default=os.path.join(ROOT, "build", "asset-variants"),
+                        help="directory to write qualifying variants into")
+    parser.add_argument("--no-variants", action="store_true",
+                        help="only report, do not write variant files")
+    args = parser.parse_args()
+
+    overrides = []
+    for spec in args.budget_for:
+        pattern, _, value = spec.rpartition("=")
+        overrides.append((pattern, float(value)))
+
+    rows = [analyze(p, budget_for(os.path.relpath(p, ROOT), args.budget, overrides))
+            for p in find_assets()]
+    print_report(rows)
+    if not args.no_variants:
+        write_variants(rows, args.variants)
+        print(f"Variants written to {args.variants}")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Render icon, splash and screenshots for many white-label apps in one run.
+
+Reads a JSON list of app configs shaped like generate_assets.APP:
+
+    [{"slug": "stampcard", "name": "...", "initial": "ス",
+      "palette": {"bg0": "#FFFBEB", "bg1": "#FEF3C7", "primary": "#F97316",
+                  "accent": "#F59E0B", "text": "#292524", "dark": false},
+      "captions": ["...", "..."], "tagline": "...",
+      "locales": {"en": {"name": "...", "captions": ["..."], "tagline": "..."}}}]
+
+Jobs run on a pool of long-lived worker processes, so fonts and gradients
+cached by generate_assets stay warm across the apps a worker handles instead
+of paying one interpreter launch per app. A failing job is reported and does
+not stop the others.
+
+Usage: python3 batch_assets.py apps.json [--out build/apps|apps.zip] [--workers N]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import generate_assets
+import output_sink
+import render_cache
+
+REQUIRED_KEYS = ("slug", "name", "initial", "palette", "captions")
+
+
+def run_job(app, out_root):
+    """Render one app; never raises, returns (slug, files, seconds, error).
+
+    With a directory `out_root` the worker writes files itself and `files` is
+    a count. With an archive the worker renders into memory and `files` is the
+    {name: bytes} dict for the parent to stream into the single archive.
+    """
+    slug = app.get("slug", "?")
+    t0 = time.perf_counter()
+    try:
+        missing = [k for k in REQUIRED_KEYS if k not in app]
+        if missing:
+            raise KeyError(f"missing config keys: {', '.join(missing)}")
+        if output_sink.is_archive(out_root):
+            sink = output_sink.MemorySink()
+            generate_assets.generate(app, sink)
+            files = {f"{slug}/{name}": data for name, data in sink.files.items()}
+        else:
+            files = len(generate_assets.generate(app, output_sink.DirSink(os.path.join(out_root, slug))))
+        return slug, files, time.perf_counter() - t0, None
+    except Exception:
+        return slug, 0, time.perf_counter() - t0, traceback.format_exc()
+    finally:
+        render_cache.flush_stats()  # pool workers never run atexit handlers
+
+
+def run_isolated(app, out_root):
+    """Rerun one job in a process of its own, for jobs caught in a crashed pool."""
+    with ProcessPoolExecutor(1) as pool:
+        try:
+            return pool.submit(run_job, app, out_root).result()
+        except BrokenProcessPool:
+            return app.get("slug", "?"), 0, 0.0, "worker process died (crash or out of memory)\n"
+
+
+def run_batch(apps, out_root, workers=None):
+    """Run every job; returns ([(slug, files, seconds, error)], elapsed seconds).
+
+    A worker killed by a crash or the OOM killer breaks the whole pool, and
+    every job still in it fails with BrokenProcessPool. Those jobs are rerun
+    one by one in fresh processes, so only the one that actually crashes is
+    reported as failed.
+    """
+    t0 = time.perf_counter()
+    results = []
+    archive = output_sink.open_sink(out_root) if output_sink.is_archive(out_root) else None
+    try:
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(run_job, app, out_root) for app in apps]
+            for app, fut in zip(apps, futures):
+                try:
+                    slug, files, seconds, error = fut.result()
+                except BrokenProcessPool:
+                    slug, files, seconds, error = run_isolated(app, out_root)
+                if archive is not None and not error:
+                    for name, data in files.items():
+                        archive.write(name, data)
+                    files = len(files)
+                results.append((slug, files, seconds, error))
+                status = "FAILED" if error else f"{files} files"
+                print(f"  {slug:<24} {status:<12} {seconds:6.2f}s")
+    finally:
+        if archive is not None:
+            archive.close()
+    return results, time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="White-label asset batch runner")
+    parser.add_argument("config", help="JSON file with a list of app configs")
+    parser.add_argument("--out", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                      "build", "apps"),
+                        help="output directory, or a .zip/.tar/.tar.gz archive for all apps")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    with open(args.config, encoding="utf-8") as f:
+        apps = json.load(f)
+
+    print(f"Rendering {len(apps)} apps into {args.out}")
+    results, elapsed = run_batch(apps, args.out, args.workers)
+    failed = [(slug, error) for slug, _, _, error in results if error]
+    for slug, error in failed:
+        print(f"\n── {slug} failed ──\n{error}", file=sys.stderr)
+    done = len(results) - len(failed)
+    print(f"\n{done}/{len(results)} jobs succeeded in {elapsed:.1f}s "
+          f"({60 * done / max(elapsed, 1e-9):.1f} jobs/min)")
+    sys.exit(1 if failed else 0)
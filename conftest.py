@@ -0,0 +1,12 @@
+import os
+
+import generate_screenshots
+
+# The screenshots are laid out with a macOS system font; elsewhere render the
+# tests with the first sans candidate that is installed
+if not os.path.exists(generate_screenshots.FONT_PATH):
+    import font_coverage
+
+    generate_screenshots.FONT_PATH = next(
+        (path for path, _ in font_coverage.SANS_CANDIDATES if os.path.exists(path)),
+        generate_screenshots.FONT_PATH)
@@ -0,0 +1,332 @@
+"""
+Recording canvas: capture drawing as a display list, replay it at any scale.
+
+DisplayList mirrors the ImageDraw methods the screenshot helpers use
+(rectangle, rounded_rectangle, ellipse, arc, polygon, line, text), so
+`draw_cloud(dl, -20, y)` records instead of painting. Work that needs real
+pixels (masked gradients, SDF batches, particles, font-chain text) is recorded
+as raster() callbacks that are handed the replay scale, and translucent
+overlays as layer() sub-lists drawn onto an overlay the size of their bounding
+box (the whole canvas if they contain raster ops, which draw in canvas
+coordinates) and composited there.
+
+replay() first resolves the list against the canvas:
+  - ops whose bounds miss the canvas are culled
+  - polygons, two-point lines and rectangles are clipped to the canvas
+    (ellipses, arcs, rounded rects and text are only culled)
+  - runs of same-state rectangles stacked row on row are merged into one
+    (a vertical gradient becomes one rectangle per distinct color)
+
+Layout runs once, at record time; replaying the same list at scale=2 renders
+a 2x canvas without running any of the Python layout code again.
+
+replay(draft=True) is for quick layout iteration: text is drawn without
+anti-aliasing and raster ops run their recorded `draft` stand-in (a cheaper
+approximation of the same geometry, or `skip` to leave them out).
+
+    dl = DisplayList((W, H))
+    draw_cloud(dl, -20, H - 200, scale=0.7)
+    img = dl.replay(scale=2)
+    print(dl.stats)  # recorded / culled / clipped / merged / drawn
+"""
+
+from PIL import Image, ImageDraw
+
+import render_context
+
+BOX_KINDS = ("rectangle", "rounded_rectangle", "ellipse", "arc")
+
+
+def _box(xy):
+    """(x0, y0, x1, y1) from [x0, y0, x1, y1] or [(x0, y0), (x1, y1)]."""
+    if len(xy) == 2:
+        (x0, y0), (x1, y1) = xy
+        return (x0, y0, x1, y1)
+    return tuple(xy)
+
+
+def _points(xy):
+    """[(x, y), ...] from a flat or paired coordinate sequence."""
+    if xy and not isinstance(xy[0], (tuple, list)):
+        return [(xy[i], xy[i + 1]) for i in range(0, len(xy), 2)]
+    return [tuple(p) for p in xy]
+
+
+def scale_box(box, s):
+    """Scale an inclusive pixel box so it covers the same area at scale `s`.
+
+    Below 1x a box never shrinks past one pixel, so hairlines stay visible.
+    """
+    if s == 1:
+        return box
+    x0, y0, x1, y1 = box
+    x0, y0 = round(x0 * s), round(y0 * s)
+    return (x0, y0, max(x0, round((x1 + 1) * s) - 1), max(y0, round((y1 + 1) * s) - 1))
+
+
+def scale_point(xy, s):
+    return xy if s == 1 else (round(xy[0] * s), round(xy[1] * s))
+
+
+def _scale_width(w, s):
+    return w if s == 1 or not w else max(1, round(w * s))
+
+
+def scale_font(font, s):
+    if s == 1:
+        return font
+    return render_context.current().font(font.path, max(1, round(font.size * s)), font.index)
+
+
+class DisplayList:
+    def __init__(self, size):
+        self.size = size
+        self.ops = []
+        self.stats = {}
+
+    # ── ImageDraw-compatible recording ──
+
+    def rectangle(self, xy, fill=None, outline=None, width=1):
+        self.ops.append(("rectangle", _box(xy), {"fill": fill, "outline": outline, "width": width}))
+
+    def rounded_rectangle(self, xy, radius=0, fill=None, outline=None, width=1):
+        self.ops.append(("rounded_rectangle", _box(xy),
+                         {"radius": radius, "fill": fill, "outline": outline, "width": width}))
+
+    def ellipse(self, xy, fill=None, outline=None, width=1):
+        self.ops.append(("ellipse", _box(xy), {"fill": fill, "outline": outline, "width": width}))
+
+    def arc(self, xy, start, end, fill=None, width=1):
+        self.ops.append(("arc", _box(xy), {"start": start, "end": end, "fill": fill, "width": width}))
+
+    def polygon(self, xy, fill=None, outline=None, width=1):
+        self.ops.append(("polygon", _points(xy), {"fill": fill, "outline": outline, "width": width}))
+
+    def line(self, xy, fill=None, width=0):
+        self.ops.append(("line", _points(xy), {"fill": fill, "width": width}))
+
+    def text(self, xy, text, fill=None, font=None, anchor=None):
+        self.ops.append(("text", tuple(xy), {"text": text, "fill": fill, "font": font,
+                                             "anchor": anchor}))
+
+    # ── Raster ops ──
+
+    def layer(self):
+        """Sub-list drawn on a transparent overlay and alpha-composited on top."""
+        child = DisplayList(self.size)
+        self.ops.append(("layer", None, {"list": child}))
+        return child
+
+    def raster(self, fn, *args, bounds=None, draft=None):
+        """Record fn(img, scale, *args); it draws in place or returns a new image.
+
+        `bounds` (x0, y0, x1, y1) in record coordinates lets the op be culled;
+        without it the op always runs. `draft` (same signature) replaces fn in
+        draft replays.
+        """
+        self.ops.append(("raster", bounds, {"fn": fn, "args": args, "draft": draft or fn}))
+
+    # ── Replay ──
+
+    def replay(self, scale=1.0, img=None, draft=False):
+        """Render onto `img` (default: a transparent canvas of size * scale)."""
+        W, H = self.size
+        if img is None:
+            img = Image.new("RGBA", (round(W * scale), round(H * scale)), (0, 0, 0, 0))
+        self.stats = dict.fromkeys(("recorded", "culled", "clipped", "merged", "drawn"), 0)
+        ops = _resolve(self.ops, (W, H), self.stats)
+        return _execute(img, ops, scale, draft)
+
+
+def skip(img, scale, *args):
+    """Draft stand-in for raster ops that are left out of draft replays."""
+
+
+# ── Cull / clip / merge ──
+
+def _bounds(kind, geom, state):
+    """Exclusive (x0, y0, x1, y1) covered by an op, None if unknown."""
+    if kind in BOX_KINDS:
+        x0, y0, x1, y1 = geom
+        return (min(x0, x1), min(y0, y1), max(x0, x1) + 1, max(y0, y1) + 1)
+    if kind in ("polygon", "line"):
+        pad = (state.get("width") or 1) / 2 + 1
+        xs = [x for x, _ in geom]
+        ys = [y for _, y in geom]
+        return (min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad)
+    if kind == "text":
+        if state["font"] is None:
+            return None
+        l, t, r, b = state["font"].getbbox(state["text"], anchor=state["anchor"])
+        return (geom[0] + l, geom[1] + t, geom[0] + r, geom[1] + b)
+    return geom  # raster / layer carry their bounds in geom
+
+
+def _inside(bounds, size):
+    W, H = size
+    return bounds is None or (bounds[2] > 0 and bounds[3] > 0 and bounds[0] < W and bounds[1] < H)
+
+
+def _contained(bounds, size):
+    return bounds[0] >= 0 and bounds[1] >= 0 and bounds[2] <= size[0] and bounds[3] <= size[1]
+
+
+def _clip_polygon(points, rect):
+    """Sutherland-Hodgman clip of a polygon against an axis-aligned rect."""
+    x0, y0, x1, y1 = rect
+    edges = [(0, x0, 1), (1, y0, 1), (0, x1, -1), (1, y1, -1)]
+    for axis, limit, sign in edges:
+        if not points:
+            break
+        out = []
+        prev = points[-1]
+        prev_in = (prev[axis] - limit) * sign >= 0
+        for p in points:
+            p_in = (p[axis] - limit) * sign >= 0
+            if p_in != prev_in:
+                t = (limit - prev[axis]) / (p[axis] - prev[axis])
+                out.append((prev[0] + (p[0] - prev[0]) * t, prev[1] + (p[1] - prev[1]) * t))
+            if p_in:
+                out.append(p)
+            prev, prev_in = p, p_in
+        points = out
+    return points
+
+
+def _clip_segment(p, q, rect):
+    """Liang-Barsky clip of segment pq; None when it misses the rect."""
+    x0, y0, x1, y1 = rect
+    dx, dy = q[0] - p[0], q[1] - p[1]
+    t0, t1 = 0.0, 1.0
+    for edge, dist in ((-dx, p[0] - x0), (dx, x1 - p[0]), (-dy, p[1] - y0), (dy, y1 - p[1])):
+        if edge == 0:
+            if dist < 0:
+                return None
+            continue
+        t = dist / edge
+        if edge < 0:
+            t0 = max(t0, t)
+        else:
+            t1 = min(t1, t)
+        if t0 > t1:
+            return None
+    return [(p[0] + dx * t0, p[1] + dy * t0), (p[0] + dx * t1, p[1] + dy * t1)]
+
+
+def _clip(kind, geom, state, size):
+    """Clipped geometry, or None when nothing visible remains."""
+    # Keep the clip edge (and any outline along it) just outside the canvas
+    m = (state.get("width") or 1) + 1
+    rect = (-m, -m, size[0] + m, size[1] + m)
+    if kind == "polygon":
+        points = _clip_polygon(geom, rect)
+        return points if len(points) >= 3 else None
+    if kind == "line":
+        return _clip_segment(geom[0], geom[1], rect) if len(geom) == 2 else geom
+    x0, y0, x1, y1 = geom
+    return (max(x0, rect[0]), max(y0, rect[1]), min(x1, rect[2]), min(y1, rect[3]))
+
+
+def _mergeable(prev, kind, geom, state):
+    if kind != "rectangle" or not prev or prev[0] != "rectangle" or prev[2] != state:
+        return False
+    px0, py0, px1, py1 = prev[1]
+    x0, y0, x1, y1 = geom
+    return (px0, px1) == (x0, x1) and py1 + 1 == y0 and state["outline"] is None
+
+
+def _resolve(ops, size, stats):
+    """Cull, clip and merge `ops` against a canvas of `size` (record coordinates)."""
+    out = []
+    for kind, geom, state in ops:
+        if kind == "layer":
+            child = _resolve(state["list"].ops, size, stats)
+            if not child:
+                continue
+            boxes = [_bounds(*op) for op in child]
+            if any(b is None for b in boxes):
+                bounds = (0, 0) + tuple(size)
+            else:
+                bounds = (min(b[0] for b in boxes), min(b[1] for b in boxes),
+                          max(b[2] for b in boxes), max(b[3] for b in boxes))
+            out.append(("layer", bounds, {"ops": child}))
+            continue
+
+        stats["recorded"] += 1
+        bounds = _bounds(kind, geom, state)
+        if not _inside(bounds, size):
+            stats["culled"] += 1
+            continue
+        if kind in ("polygon", "line", "rectangle") and not _contained(bounds, size):
+            clipped = _clip(kind, geom, state, size)
+            if clipped is None:
+                stats["culled"] += 1
+                continue
+            if clipped != geom:
+                stats["clipped"] += 1
+            geom = clipped
+        if _mergeable(out[-1] if out else None, kind, geom, state):
+            px0, py0, px1, _ = out[-1][1]
+            out[-1] = ("rectangle", (px0, py0, px1, geom[3]), state)
+            stats["merged"] += 1
+            continue
+        out.append((kind, geom, state))
+    stats["drawn"] = stats["recorded"] - stats["culled"] - stats["merged"]
+    return out
+
+
+# ── Execution ──
+
+def _draw(img, draft):
+    draw = ImageDraw.Draw(img)
+    if draft:
+        draw.fontmode = "1"
+    return draw
+
+
+def _shift_box(box, origin):
+    ox, oy = origin
+    return box if not (ox or oy) else (box[0] - ox, box[1] - oy, box[2] - ox, box[3] - oy)
+
+
+def _has_raster(ops):
+    return any(kind == "raster" or (kind == "layer" and _has_raster(state["ops"]))
+               for kind, _, state in ops)
+
+
+def _execute(img, ops, s, draft=False, origin=(0, 0)):
+    """Draw resolved `ops` at scale `s`; `origin` is the canvas pixel at img's top-left."""
+    ox, oy = origin
+    draw = _draw(img, draft)
+    for kind, geom, state in ops:
+        if kind == "raster":
+            result = state["draft" if draft else "fn"](img, s, *state["args"])
+            if result is not None:
+                img = result
+                draw = _draw(img, draft)
+        elif kind == "layer":
+            x0, y0, x1, y1 = geom
+            box = (max(ox, int(x0 * s)), max(oy, int(y0 * s)),
+                   min(ox + img.size[0], int(x1 * s) + 1), min(oy + img.size[1], int(y1 * s) + 1))
+            if box[2] <= box[0] or box[3] <= box[1]:
+                continue
+            if _has_raster(state["ops"]):
+                # raster callbacks draw in canvas coordinates: give them the whole canvas
+                box = (ox, oy, ox + img.size[0], oy + img.size[1])
+            overlay = Image.new("RGBA", (box[2] - box[0], box[3] - box[1]), (0, 0, 0, 0))
+            overlay = _execute(overlay, state["ops"], s, draft, origin=box[:2])
+            img.alpha_composite(overlay, dest=(box[0] - ox, box[1] - oy))
+        elif kind in BOX_KINDS:
+            kw = dict(state, width=_scale_width(state["width"], s))
+            if "radius" in kw:
+                kw["radius"] = kw["radius"] if s == 1 else round(kw["radius"] * s)
+            getattr(draw, kind)(_shift_box(scale_box(geom, s), origin), **kw)
+        elif kind in ("polygon", "line"):
+            points = [(x * s - ox, y * s - oy) for x, y in geom] if s != 1 or ox or oy else geom
+            getattr(draw, kind)(points, **dict(state, width=_scale_width(state["width"], s)))
+        elif kind == "text":
+            font = scale_font(state["font"], s) if state["font"] is not None else None
+            x, y = scale_point(geom, s)
+            draw.text((x - ox, y - oy), state["text"], fill=state["fill"], font=font,
+                      anchor=state["anchor"])
+    return img
@@ -0,0 +1,268 @@
+"""
+Per-codepoint font coverage index for mixed emoji / CJK / Latin text.
+
+A FontChain is an ordered list of candidate font files. Their cmap tables are
+read once (a small built-in parser, no extra dependency) into sorted codepoint
+ranges. Text is split into runs by the first font in the chain that covers
+each codepoint, and every run is measured and drawn with its own font, so
+"⭐", "⚙️" or "🏠" next to Japanese text get real glyphs instead of tofu and
+no draw call has to probe fonts by trial and error.
+
+Variation selectors, ZWJ and combining marks stay in the run of the character
+they modify. Color bitmap fonts that only have fixed strikes (Apple Color
+Emoji, Noto Color Emoji) are rendered at their strike size and scaled.
+
+    fonts = make_chain("sans")  # or RenderContext.chain("sans") when rendering
+    width = fonts.width("⚙️ せってい", 22)
+    fonts.draw(img, (x, y), "⚙️ せってい", 22, fill=(45, 52, 54))
+    size = fonts.fit("Stempel holen!", 232, 22)  # largest size <= 22 that fits 232px
+"""
+
+import math
+import os
+import struct
+import unicodedata
+from bisect import bisect_right
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+
+import render_cache
+
+# (path, face index in a .ttc) in priority order; missing files are skipped
+SANS_CANDIDATES = [
+    ("/System/Library/Fonts/Hiragino Sans GB.ttc", 0),
+    ("/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc", 0),
+    ("/System/Library/Fonts/Apple Color Emoji.ttc", 0),
+    ("/usr/share/fonts/truetype/noto/NotoColorEmoji.ttf", 0),
+    ("/System/Library/Fonts/Apple Symbols.ttf", 0),
+    ("/System/Library/Fonts/Kohinoor.ttc", 0),
+    ("/usr/share/fonts/truetype/noto/NotoSansDevanagari-Regular.ttf", 0),
+    ("/System/Library/Fonts/GeezaPro.ttc", 0),
+    ("/usr/share/fonts/truetype/noto/NotoSansArabic-Regular.ttf", 0),
+    ("/System/Library/Fonts/Supplemental/Arial Unicode.ttf", 0),
+    ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 0),
+]
+
+BOLD_CANDIDATES = [
+    ("/System/Library/Fonts/HelveticaNeue.ttc", 1),
+    ("/System/Library/Fonts/Supplemental/Arial Bold.ttf", 0),
+    ("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 0),
+    ("/System/Library/Fonts/Hiragino Sans GB.ttc", 1),
+    ("/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc", 0),
+] + SANS_CANDIDATES
+
+# Codepoints that never start a new run
+_JOINERS = {0x200C, 0x200D, 0xFE0E, 0xFE0F, 0x20E3}
+
+
+# ── cmap parsing ──
+
+def _table_offsets(data, face_offset):
+    num_tables = struct.unpack_from(">H", data, face_offset + 4)[0]
+    tables = {}
+    for i in range(num_tables):
+        tag, _, offset, length = struct.unpack_from(">4sIII", data, face_offset + 12 + 16 * i)
+        tables[tag] = (offset, length)
+    return tables
+
+
+def _cmap_ranges(data, cmap_offset):
+    """Return sorted (start, end) codepoint ranges from the best cmap subtable."""
+    _, n = struct.unpack_from(">HH", data, cmap_offset)
+    subtables = {}
+    for i in range(n):
+        pid, eid, off = struct.unpack_from(">HHI", data, cmap_offset + 4 + 8 * i)
+        fmt = struct.unpack_from(">H", data, cmap_offset + off)[0]
+        subtables[(pid, eid, fmt)] = cmap_offset + off
+    for pref in [(3, 10, 12), (0, 6, 12), (0, 4, 12), (3, 1, 4), (0, 3, 4), (0, 4, 4), (3, 0, 4)]:
+        if pref in subtables:
+            off = subtables[pref]
+            return _format12(data, off) if pref[2] == 12 else _format4(data, off)
+    return []
+
+
+def _format4(data, off):
+    seg_count = struct.unpack_from(">H", data, off + 6)[0] // 2
+    ends = struct.unpack_from(f">{seg_count}H", data, off + 14)
+    starts = struct.unpack_from(f">{seg_count}H", data, off + 16 + 2 * seg_count)
+    return [(s, e) for s, e in zip(starts, ends) if s != 0xFFFF]
+
+
+def _format12(data, off):
+    n = struct.unpack_from(">I", data, off + 12)[0]
+    groups = struct.unpack_from(f">{3 * n}I", data, off + 16)
+    return [(groups[i], groups[i + 1]) for i in range(0, 3 * n, 3)]
+
+
+def read_cmap(path, index=0):
+    """Covered codepoint ranges of face `index` in a .ttf/.otf/.ttc file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    face_offset = 0
+    if data[:4] == b"ttcf":
+        face_offset = struct.unpack_from(">I", data, 12 + 4 * index)[0]
+    tables = _table_offsets(data, face_offset)
+    if b"cmap" not in tables:
+        return []
+    return sorted(_cmap_ranges(data, tables[b"cmap"][0]))
+
+
+def _cached_cmap(path, index):
+    st = os.stat(path)
+
+    def compute():
+        ranges = read_cmap(path, index)
+        return struct.pack(f"<{2 * len(ranges)}I", *[v for r in ranges for v in r])
+
+    raw = render_cache.cached_bytes("cmap", (path, index, st.st_size, st.st_mtime), compute,
+                                    code=read_cmap)
+    flat = struct.unpack(f"<{len(raw) // 4}I", raw)
+    return list(zip(flat[0::2], flat[1::2]))
+
+
+class _Coverage:
+    def __init__(self, ranges):
+        self.starts = [s for s, _ in ranges]
+        self.ends = [e for _, e in ranges]
+
+    def __contains__(self, cp):
+        i = bisect_right(self.starts, cp) - 1
+        return i >= 0 and cp <= self.ends[i]
+
+
+# ── Font chain ──
+
+class FontChain:
+    def __init__(self, candidates):
+        self.faces = []
+        for path, index in candidates:
+            if os.path.exists(path) and (path, index) not in [f[:2] for f in self.faces]:
+                try:
+                    self.faces.append((path, index, _Coverage(_cached_cmap(path, index))))
+                except (OSError, struct.error):
+                    continue
+        if not self.faces:
+            raise OSError("none of the chain's fonts could be loaded: "
+                          + ", ".join(path for path, _ in candidates))
+        self._face_for = lru_cache(maxsize=4096)(self._face_for_uncached)
+        self.runs = lru_cache(maxsize=1024)(self._runs)
+        self.font = lru_cache(maxsize=256)(self._font)
+        self._run_width = lru_cache(maxsize=4096)(self._run_width_uncached)
+        self.fit = lru_cache(maxsize=4096)(self._fit)
+
+    def _face_for_uncached(self, cp):
+        for i, (_, _, coverage) in enumerate(self.faces):
+            if cp in coverage:
+                return i
+        return 0  # nobody covers it: let the primary font draw its notdef
+
+    def _runs(self, text):
+        """Split text into (face_index, substring) runs."""
+        runs = []
+        for ch in text:
+            cp = ord(ch)
+            attach = runs and (cp in _JOINERS or unicodedata.combining(ch)
+                               or runs[-1][1].endswith("\u200d"))
+            face = runs[-1][0] if attach else self._face_for(cp)
+            if runs and runs[-1][0] == face:
+                runs[-1] = (face, runs[-1][1] + ch)
+            else:
+                runs.append((face, ch))
+        return tuple(runs)
+
+    def _font(self, face, size):
+        """(FreeTypeFont, scale): fixed-strike bitmap fonts load at their strike size."""
+        path, index, _ = self.faces[face]
+        try:
+            return ImageFont.truetype(path, size, index=index), 1.0
+        except OSError:
+            for strike in (160, 109, 136, 96, 64, 48, 40, 32, 20):
+                try:
+                    return ImageFont.truetype(path, strike, index=index), size / strike
+                except OSError:
+                    continue
+            raise
+
+    def _run_width_uncached(self, face, run, size):
+        f, scale = self.font(face, size)
+        return f.getlength(run) * scale
+
+    def width(self, text, size):
+        return sum(self._run_width(face, run, size) for face, run in self.runs(text))
+
+    def _fit(self, text, max_width, size, min_size=8):
+        """Largest integer size in [min_size, size] at which `text` fits `max_width`.
+
+        Binary search over measured widths (width grows with size, give or
+        take hinting). Returns min_size when even that overflows.
+        """
+        if self.width(text, size) <= max_width:
+            return size
+        lo, hi = min_size, size - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self.width(text, mid) <= max_width:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo
+
+    def metrics(self, size):
+        """(ascent, descent) of the primary face at `size`."""
+        return self.font(0, size)[0].getmetrics()
+
+    def bbox(self, text, size):
+        """Ink box relative to the draw origin, like ImageDraw.textbbox((0, 0), ...)."""
+        ascent = self.metrics(size)[0]
+        x, box = 0.0, None
+        for face, run in self.runs(text):
+            f, scale = self.font(face, size)
+            l, t, r, b = f.getbbox(run, anchor="ls")
+            run_box = (x + l * scale, ascent + t * scale, x + r * scale, ascent + b * scale)
+            box = run_box if box is None else (min(box[0], run_box[0]), min(box[1], run_box[1]),
+                                               max(box[2], run_box[2]), max(box[3], run_box[3]))
+            x += self._run_width(face, run, size)
+        if box is None:
+            return (0, 0, 0, 0)
+        return tuple(int(round(v)) for v in box)
+
+    def draw(self, img, xy, text, size, fill, aliased=False):
+        """Draw `text` with its top-left at xy (like ImageDraw.text); returns the width.
+
+        aliased=True skips anti-aliasing and scales bitmap strikes nearest-neighbor
+        (draft renders); glyph positions are unchanged.
+        """
+        x, y = xy
+        baseline = y + self.metrics(size)[0]
+        draw = ImageDraw.Draw(img)
+        if aliased:
+            draw.fontmode = "1"
+        for face, run in self.runs(text):
+            f, scale = self.font(face, size)
+            if scale == 1.0:
+                draw.text((x, baseline), run, font=f, fill=fill, anchor="ls", embedded_color=True)
+            else:
+                # Bitmap strike: render at native size, scale, composite
+                w = int(f.getlength(run)) + 2
+                asc, desc = f.getmetrics()
+                tmp = Image.new("RGBA", (w, asc + desc), (0, 0, 0, 0))
+                ImageDraw.Draw(tmp).text((0, asc), run, font=f, fill=fill, anchor="ls",
+                                         embedded_color=True)
+                tmp = tmp.resize((max(1, round(w * scale)), max(1, round((asc + desc) * scale))),
+                                 Image.NEAREST if aliased else Image.LANCZOS)
+                dest = (math.floor(x), math.floor(baseline - asc * scale))
+                if img.mode == "RGBA":
+                    # Clip at the top/left edge instead of shifting onto the canvas
+                    img.alpha_composite(tmp, dest=(max(0, dest[0]), max(0, dest[1])),
+                                        source=(max(0, -dest[0]), max(0, -dest[1])))
+                else:
+                    img.paste(tmp, dest, tmp)
+            x += self._run_width(face, run, size)
+        return x - xy[0]
+
+
+def make_chain(name="sans", primary=None):
+    """A new chain ('sans' or 'bold'), optionally led by `primary`."""
+    candidates = SANS_CANDIDATES if name == "sans" else BOLD_CANDIDATES
+    return FontChain(([(primary, 0)] if primary else []) + candidates)
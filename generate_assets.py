@@ -1,22 +1,56 @@
 #!/usr/bin/env python3
-"""Auto-generated asset script for スタンプカードアプリ (theme: Warm Daily)"""
-from PIL import Image, ImageDraw, ImageFont
+"""Auto-generated asset script for スタンプカードアプリ (theme: Warm Daily)
+
+The app's name, initial, palette and captions live in APP below; batch_assets.py
+renders the same icon/splash/screenshot templates for other app configs.
+
+With --splash minimal the splash is not a full-screen bitmap: only its content
+(the app name) is rendered onto a small transparent strip at @3x, and
+app.json's splash gets a solid backgroundColor and resizeMode "contain". Expo
+loads that one image on every device, so it is drawn at the highest density.
+
+With --draft every asset is rendered at half scale (same layout, aliased
+text), encoded with the fastest PNG settings and written to draft/, with
+render and encode times printed per asset.
+"""
+import argparse
+import json
+import time
+from functools import lru_cache
+from PIL import Image, ImageDraw
 import os
 
+import display_list
+import output_sink
+import render_cache
+import render_context
+
 ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
-os.makedirs(ASSETS_DIR, exist_ok=True)
+APP_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.json")
+SPLASH_SCALE = 3  # the full splash is drawn at @3x (1284x2778); Expo loads one image
+SAFE_MARGIN = 60  # text narrower than 1284 - 2 * SAFE_MARGIN; longer strings are shrunk to fit
+DRAFT_SCALE = 0.5
+DRAFT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "draft")
 
 def hex_to_rgb(h):
     h = h.lstrip("#")
     return tuple(int(h[i:i+2], 16) for i in (0, 2, 4))
 
-BG0 = hex_to_rgb("#FFFBEB")
-BG1 = hex_to_rgb("#FEF3C7")
-PRIMARY = hex_to_rgb("#F97316")
-ACCENT = hex_to_rgb("#F59E0B")
-TEXT = hex_to_rgb("#292524")
+APP = {
+    "name": "スタンプカードアプリ",
+    "initial": "ス",
+    "palette": {
+        "bg0": "#FFFBEB",
+        "bg1": "#FEF3C7",
+        "primary": "#F97316",
+        "accent": "#F59E0B",
+        "text": "#292524",
+        "dark": False,
+    },
+    "captions": ["今日やることがひと目でわかる","家族みんなで使えるシンプル設計","習慣づけを楽しくサポート","生活をスマートに整理しよう"],
+    "tagline": "毎日をもっとかんたん、もっと楽しく。",
+}
 WHITE = (255, 255, 255)
-IS_DARK = False
 
 def gradient(draw, w, h, c1, c2):
     for y in range(h):
@@ -25,76 +59,210 @@ def gradient(draw, w, h, c1, c2):
         b = int(c1[2] + (c2[2] - c1[2]) * y / h)
         draw.line([(0, y), (w, y)], fill=(r, g, b))
 
-def try_font(size):
-    for name in ["/System/Library/Fonts/HelveticaNeue.ttc",
-                 "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
-                 "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"]:
-        try:
-            return ImageFont.truetype(name, size)
-        except (OSError, IOError):
-            pass
-    return ImageFont.load_default()
+@lru_cache(maxsize=16)
+def _gradient_image(w, h, c1, c2):
+    def render():
+        img = Image.new("RGB", (w, h))
+        gradient(ImageDraw.Draw(img), w, h, c1, c2)
+        return img
+    return render_cache.cached_image("gradient", (w, h, c1, c2), render, code=gradient)
 
-# ── App Icon (1024x1024) ──
-icon = Image.new("RGB", (1024, 1024))
-d = ImageDraw.Draw(icon)
-gradient(d, 1024, 1024, BG0, BG1)
+def gradient_canvas(w, h, c1, c2):
+    """A fresh canvas filled with the gradient; the gradient itself is cached."""
+    return _gradient_image(w, h, c1, c2).copy()
 
-# Center circle
-d.ellipse([312, 312, 712, 712], fill=PRIMARY)
-# App initial
-font_big = try_font(200)
-initial = "ス"
-bbox = d.textbbox((0, 0), initial, font=font_big)
-tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
-d.text(((1024 - tw) // 2, (1024 - th) // 2 - 20), initial, fill=WHITE, font=font_big)
+def fonts():
+    """Bold UI font with per-codepoint CJK/emoji fallbacks for every locale."""
+    return render_context.current().chain("bold")
 
-# Accent ring
-d.ellipse([292, 292, 732, 732], outline=ACCENT, width=8)
+def colors(app):
+    p = app["palette"]
+    return {
+        "bg0": hex_to_rgb(p["bg0"]),
+        "bg1": hex_to_rgb(p["bg1"]),
+        "primary": hex_to_rgb(p["primary"]),
+        "accent": hex_to_rgb(p["accent"]),
+        "text": hex_to_rgb(p["text"]),
+        "dark": p.get("dark", False),
+    }
 
-icon.save(os.path.join(ASSETS_DIR, "app_icon.png"))
+def px(v, k):
+    """A design-space length or coordinate at render scale `k`."""
+    return v if k == 1 else round(v * k)
+
+# ── App Icon (1024x1024) ──
+def render_icon(app, k=1, draft=False):
+    c = colors(app)
+    icon = gradient_canvas(px(1024, k), px(1024, k), c["bg0"], c["bg1"])
+    d = ImageDraw.Draw(icon)
+
+    # Center circle
+    d.ellipse(display_list.scale_box((312, 312, 712, 712), k), fill=c["primary"])
+    # App initial
+    initial = app["initial"]
+    size = px(200, k)
+    bbox = fonts().bbox(initial, size)
+    tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
+    side = px(1024, k)
+    fonts().draw(icon, ((side - tw) // 2, (side - th) // 2 - px(20, k)), initial, size, fill=WHITE,
+                 aliased=draft)
+
+    # Accent ring
+    d.ellipse(display_list.scale_box((292, 292, 732, 732), k), outline=c["accent"],
+              width=max(1, px(8, k)))
+    return icon
 
 # ── Splash (1284x2778) ──
-splash = Image.new("RGB", (1284, 2778))
-d = ImageDraw.Draw(splash)
-gradient(d, 1284, 2778, BG0, BG1)
-font_splash = try_font(80)
-name = "スタンプカードアプリ"
-bbox = d.textbbox((0, 0), name, font=font_splash)
-tw = bbox[2] - bbox[0]
-d.text(((1284 - tw) // 2, 1300), name, fill=PRIMARY, font=font_splash)
-splash.save(os.path.join(ASSETS_DIR, "splash.png"))
+def render_splash(app, k=1, draft=False):
+    c = colors(app)
+    splash = gradient_canvas(px(1284, k), px(2778, k), c["bg0"], c["bg1"])
+    name = app["name"]
+    size = px(fonts().fit(name, 1284 - 2 * SAFE_MARGIN, 80), k)
+    bbox = fonts().bbox(name, size)
+    tw = bbox[2] - bbox[0]
+    fonts().draw(splash, ((px(1284, k) - tw) // 2, px(1300, k)), name, size, fill=c["primary"],
+                 aliased=draft)
+    return splash
 
-# ── Screenshots (1284x2778) ──
-captions = ["今日やることがひと目でわかる","家族みんなで使えるシンプル設計","習慣づけを楽しくサポート","生活をスマートに整理しよう"]
-tagline_text = "毎日をもっとかんたん、もっと楽しく。"
+# ── Minimal splash (content strip) ──
+def render_splash_content(app, scale, draft=False):
+    """The splash's name line alone, on a transparent strip.
+
+    The strip is as wide as the full splash at that scale, so resizeMode
+    "contain" shows the name at the same size, and the name keeps its offset
+    from the vertical centre of the 1284x2778 design.
+    """
+    c = colors(app)
+    k = scale / 3
+    name = app["name"]
+    size = round(fonts().fit(name, 1284 - 2 * SAFE_MARGIN, 80) * k)
+    l, t, r, b = fonts().bbox(name, size)
+    w = round(1284 * k)
+    offset = 1300 * k + (t + b) / 2 - 2778 * k / 2  # ink centre vs. screen centre
+    half = int(abs(offset) + (b - t) / 2) + round(24 * k)
+    img = Image.new("RGBA", (w, 2 * half), (0, 0, 0, 0))
+    fonts().draw(img, ((w - (r - l)) // 2, round(half + offset - (t + b) / 2)), name, size,
+                 fill=c["primary"], aliased=draft)
+    return img
+
+def write_splash_config(app, path=APP_JSON):
+    """Point app.json's splash at the minimal splash: solid colour + centred content."""
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    config["expo"]["splash"] = {**config["expo"].get("splash", {}),
+                                "image": "./assets/splash.png",
+                                "resizeMode": "contain",
+                                "backgroundColor": app["palette"]["bg0"]}
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(config, indent=2, ensure_ascii=False))
 
-for i, caption in enumerate(captions[:4]):
-    img = Image.new("RGB", (1284, 2778))
+# ── Screenshots (1284x2778) ──
+def render_screenshot(app, caption, k=1, draft=False):
+    c = colors(app)
+    is_dark = c["dark"]
+    img = gradient_canvas(px(1284, k), px(2778, k), c["bg0"], c["bg1"])
     d = ImageDraw.Draw(img)
-    gradient(d, 1284, 2778, BG0, BG1)
 
     # Phone frame (mock)
     frame_x, frame_y = 142, 600
     frame_w, frame_h = 1000, 1800
-    d.rounded_rectangle([frame_x, frame_y, frame_x + frame_w, frame_y + frame_h],
-                        radius=40, fill=WHITE if not IS_DARK else (30, 30, 50),
-                        outline=(200, 200, 200) if not IS_DARK else (80, 80, 120), width=3)
+    d.rounded_rectangle(display_list.scale_box((frame_x, frame_y, frame_x + frame_w,
+                                                frame_y + frame_h), k),
+                        radius=px(40, k), fill=WHITE if not is_dark else (30, 30, 50),
+                        outline=(200, 200, 200) if not is_dark else (80, 80, 120),
+                        width=max(1, px(3, k)))
 
     # Caption at top
-    font_cap = try_font(64)
-    bbox = d.textbbox((0, 0), caption, font=font_cap)
+    size = px(fonts().fit(caption, 1284 - 2 * SAFE_MARGIN, 64), k)
+    bbox = fonts().bbox(caption, size)
     tw = bbox[2] - bbox[0]
-    cap_color = WHITE if IS_DARK else TEXT
-    d.text(((1284 - tw) // 2, 200), caption, fill=cap_color, font=font_cap)
+    cap_color = WHITE if is_dark else c["text"]
+    fonts().draw(img, ((px(1284, k) - tw) // 2, px(200, k)), caption, size, fill=cap_color,
+                 aliased=draft)
 
     # Tagline at bottom
+    tagline_text = app.get("tagline")
     if tagline_text:
-        font_tag = try_font(36)
-        bbox = d.textbbox((0, 0), tagline_text, font=font_tag)
+        size = px(fonts().fit(tagline_text, 1284 - 2 * SAFE_MARGIN, 36), k)
+        bbox = fonts().bbox(tagline_text, size)
         tw = bbox[2] - bbox[0]
-        d.text(((1284 - tw) // 2, 2550), tagline_text, fill=ACCENT, font=font_tag)
+        fonts().draw(img, ((px(1284, k) - tw) // 2, px(2550, k)), tagline_text, size,
+                     fill=c["accent"], aliased=draft)
+    return img
+
+def localized(app, locale):
+    """App config with one locale's name/captions/tagline overrides applied."""
+    return {**app, **app.get("locales", {}).get(locale, {})}
+
+def generate(app, sink, splash="full", draft=False, timings=None):
+    """Render icon, splash and screenshots for `app` into an output sink.
+
+    Each entry of app["locales"] additionally gets its own splash and
+    screenshots under <locale>/. splash="minimal" writes splash.png as an @3x
+    content strip instead of the full-screen splash. draft=True renders everything at DRAFT_SCALE with aliased text
+    and fast PNG encoding. Returns the list of written paths; `timings`, if
+    given, collects (path, render seconds, encode seconds) per asset.
+    """
+    written = []
+    k = DRAFT_SCALE if draft else 1
+    encode = {"compress_level": 1} if draft else {}
+
+    def save(render, *parts):
+        t0 = time.perf_counter()
+        img = render()
+        t1 = time.perf_counter()
+        written.append(output_sink.save_image(sink, "/".join(parts), img, **encode))
+        if timings is not None:
+            timings.append((written[-1], t1 - t0, time.perf_counter() - t1))
+
+    save(lambda: render_icon(app, k, draft), "app_icon.png")
+    for locale in [None] + sorted(app.get("locales", {})):
+        cfg = localized(app, locale) if locale else app
+        sub = (locale,) if locale else ()
+        if splash == "minimal":
+            save(lambda: render_splash_content(cfg, SPLASH_SCALE * k, draft), *sub, "splash.png")
+        else:
+            save(lambda: render_splash(cfg, k, draft), *sub, "splash.png")
+        for i, caption in enumerate(cfg["captions"][:4]):
+            save(lambda: render_screenshot(cfg, caption, k, draft), *sub,
+                 f"screenshot_{str(i+1).zfill(2)}.png")
+    return written
 
-    img.save(os.path.join(ASSETS_DIR, f"screenshot_{str(i+1).zfill(2)}.png"))
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="App icon, splash and screenshot generator")
+    parser.add_argument("--out", default=None,
+                        help="output directory, or a .zip/.tar/.tar.gz archive to stream into "
+                             "(default: assets/, or draft/ with --draft)")
+    parser.add_argument("--splash", choices=["full", "minimal"], default="full",
+                        help="minimal: transparent @3x content strip + solid background in app.json")
+    parser.add_argument("--app-json", default=APP_JSON,
+                        help="app.json whose splash config --splash minimal updates "
+                             "(only when writing the final assets to assets/)")
+    parser.add_argument("--draft", action="store_true",
+                        help="fast half-scale preview with aliased text and fast PNG encoding")
+    args = parser.parse_args()
 
-print(f"Generated: app_icon.png, splash.png, {len(captions[:4])} screenshots")
+    timings = []
+    start = time.perf_counter()
+    out = args.out or (DRAFT_DIR if args.draft else ASSETS_DIR)
+    with output_sink.open_sink(out) as sink:
+        generate(APP, sink, splash=args.splash, draft=args.draft, timings=timings)
+    for path, render, encode in timings:
+        print(f"  {path}: render {render * 1000:.0f} ms, encode {encode * 1000:.0f} ms")
+    print(f"Generated: app_icon.png, splash.png, {len(APP['captions'][:4])} screenshots "
+          f"in {time.perf_counter() - start:.2f}s" + (" (draft)" if args.draft else ""))
+    if args.splash == "minimal":
+        # app.json points at assets/splash.png: leave it alone for drafts and
+        # for output that went anywhere else
+        update = not args.draft and os.path.realpath(out) == os.path.realpath(ASSETS_DIR)
+        if update:
+            write_splash_config(APP, args.app_json)
+        before = 1284 * 2778
+        w, h = render_splash_content(APP, SPLASH_SCALE).size
+        print(f"  splash.png: {w}x{h} = {w * h:,} px decoded on every device "
+              f"(full splash: {before:,} px, {before / (w * h):.0f}x fewer)")
+        if update:
+            print(f"  updated {args.app_json}: resizeMode contain, "
+                  f"backgroundColor {APP['palette']['bg0']}")
+        else:
+            print(f"  {args.app_json} not updated: output is not the final assets/ directory")
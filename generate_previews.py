@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Render animated store/social previews of the stamp and reward animations.
+
+Each scene has a static background that is rendered once per worker process
+and cached. Per frame only the dirty rectangle is redrawn: the union of what
+the animated content covered in the previous frame and in this one. Frames
+render in parallel across processes and are assembled by pasting the dirty
+crops over the running canvas, then encoded to APNG and GIF.
+
+Usage: python3 generate_previews.py [stamp|reward ...] [--fps 30] [--seconds 2]
+                                    [--workers N] [--out DIR|FILE.zip|FILE.tar.gz]
+Output: preview_stamp.png / .gif, preview_reward.png / .gif
+"""
+
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+import generate_screenshots as shots
+import output_sink
+import particles
+import render_cache
+
+SUPERSAMPLE = 4
+
+
+def ease_out_cubic(x):
+    x = min(max(x, 0.0), 1.0)
+    return 1 - (1 - x) ** 3
+
+
+def union(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def clamp_box(box, size):
+    x0, y0, x1, y1 = box
+    w, h = size
+    x0, y0 = max(0, int(math.floor(x0))), max(0, int(math.floor(y0)))
+    x1, y1 = min(w, int(math.ceil(x1))), min(h, int(math.ceil(y1)))
+    return (x0, y0, x1, y1) if x1 > x0 and y1 > y0 else None
+
+
+class StampScene:
+    """A stamp landing in the next empty slot (mirrors StampAnimation.tsx)."""
+
+    slot_index = 6  # the 7th stamp
+    particle_count = 8
+
+    def __init__(self):
+        self.background = shots.generate_screenshot_02(filled=self.slot_index, burst=False)
+        slots, self.cell = shots.main_card_slots(12)
+        self.cx, self.cy = slots[self.slot_index]
+        # Filled slot drawn once at high resolution, scaled/rotated per frame
+        big = self.cell * SUPERSAMPLE
+
+        def render():
+            sprite = Image.new("RGBA", (big + 4, big + 4), (0, 0, 0, 0))
+            shots.draw_stamp_slots(sprite, [(big // 2 + 2, big // 2 + 2)], big, [True])
+            return sprite
+        self.sprite = render_cache.cached_image("stamp_sprite", (big,), render,
+                                                code=(render, shots.draw_stamp_slots,
+                                                      shots.star_points))
+
+    def state(self, t):
+        t = t - 0.1  # short hold on the empty slot
+        if t < 0:
+            return None
+        scale = float(np.interp(t, [0, 0.15, 0.35, 0.55, 0.8], [0, 1.5, 0.8, 1.2, 1.0]))
+        bounce = float(np.interp(t, [0, 0.2, 0.35, 0.5, 0.62, 0.75], [0, 0, -24, 0, -10, 0]))
+        progress = ease_out_cubic(t / 0.9)
+        return {
+            "scale": scale,
+            "rotation": 720 * ease_out_cubic(t / 1.2),
+            "bounce": bounce,
+            "progress": progress,
+            "p_alpha": float(np.interp(progress, [0, 0.15, 0.7, 1], [0, 1, 0.8, 0])),
+            "p_scale": float(np.interp(progress, [0, 0.2, 0.5, 1], [0, 1.3, 1, 0.2])),
+            "glow": float(np.interp(t, [0, 0.15, 0.85], [0, 0.7, 0])),
+        }
+
+    def bounds(self, t):
+        s = self.state(t)
+        if s is None:
+            return None
+        half = max(self.cell * 0.75 * s["scale"],
+                   self.cell * 1.1 * s["progress"] + 8 * s["p_scale"],
+                   self.cell * 0.6 * 1.4 * min(s["scale"], 1.0)) + 3
+        cy = self.cy + s["bounce"]
+        box = (self.cx - half, min(cy, self.cy) - half, self.cx + half, max(cy, self.cy) + half)
+        return clamp_box(box, self.background.size)
+
+    def draw(self, crop, origin, t):
+        s = self.state(t)
+        if s is None:
+            return crop
+        ox, oy = origin
+        cx, cy = self.cx - ox, self.cy + s["bounce"] - oy
+        # Glow behind the stamp
+        if s["glow"] > 0.01:
+            glow = particles.Particles([cx], [cy], self.cell * 1.2 * 1.4 * min(s["scale"], 1.0),
+                                       color=[shots.hex_to_rgb(shots.ACCENT) + (int(255 * s["glow"] * 0.6),)],
+                                       shape=particles.CIRCLE)
+            crop = particles.rasterize(crop, glow)
+        # Stamp sprite
+        size = int(round(self.sprite.width * s["scale"] / SUPERSAMPLE))
+        if size >= 2:
+            sprite = self.sprite.resize((size, size), Image.LANCZOS)
+            sprite = sprite.rotate(-s["rotation"], resample=Image.BICUBIC, expand=True)
+            # Snap in canvas coordinates (round half up) so the stamp lands on
+            # the same pixel whatever the dirty rect's origin is
+            pos = (math.floor(self.cx - sprite.width / 2 + 0.5) - ox,
+                   math.floor(self.cy + s["bounce"] - sprite.height / 2 + 0.5) - oy)
+            crop.alpha_composite(sprite, dest=(max(0, pos[0]), max(0, pos[1])),
+                                 source=(max(0, -pos[0]), max(0, -pos[1])))
+        # Sparkle ring
+        if s["p_alpha"] > 0.01 and s["p_scale"] > 0.01:
+            angle = np.arange(self.particle_count) * (2 * math.pi / self.particle_count)
+            dist = self.cell * 1.1 * s["progress"]
+            ring = particles.Particles(
+                cx + np.cos(angle) * dist, cy + np.sin(angle) * dist,
+                w=8 * s["p_scale"], h=8 * s["p_scale"],
+                rotation=angle + s["progress"] * 2 * math.pi,
+                color=[shots.hex_to_rgb(shots.STAMP_FILLED) + (int(255 * s["p_alpha"]),)],
+                shape=particles.QUAD)
+            crop = particles.rasterize(crop, ring)
+        return crop
+
+
+class RewardScene:
+    """Confetti falling over the reward screen (mirrors Confetti.tsx)."""
+
+    count = 60
+
+    def __init__(self):
+        self.background = shots.generate_screenshot_04(confetti=False)
+        rng = np.random.default_rng(42)
+        W, H = self.background.size
+        self.pieces = particles.scatter_confetti(rng, self.count, (0, -H * 0.6, W, -10),
+                                                 shots.CONFETTI)
+        self.pieces.vy[:] = rng.uniform(300, 600, self.count)
+
+    def state(self, t):
+        return particles.advance(self.pieces.copy(), t, gravity=150.0)
+
+    def bounds(self, t):
+        p = self.state(t)
+        half = np.hypot(p.w, p.h) / 2 + 2
+        box = ((p.x - half).min(), (p.y - half).min(), (p.x + half).max(), (p.y + half).max())
+        return clamp_box(box, self.background.size)
+
+    def draw(self, crop, origin, t):
+        p = self.state(t)
+        p.x -= origin[0]
+        p.y -= origin[1]
+        return particles.rasterize(crop, p)
+
+
+SCENES = {"stamp": StampScene, "reward": RewardScene}
+
+# Per-process scene; its background is rendered once in the pool initializer
+_scene = None
+
+
+def _init_worker(name):
+    global _scene
+    _scene = SCENES[name]()
+    render_cache.flush_stats()  # pool workers never run atexit handlers
+
+
+def dirty_rect(scene, i, fps):
+    prev = scene.bounds((i - 1) / fps) if i else None
+    return union(prev, scene.bounds(i / fps))
+
+
+def _render_frame(args):
+    """Render frame i's dirty crop; returns (rect, raw RGBA bytes) or None."""
+    i, fps = args
+    rect = dirty_rect(_scene, i, fps)
+    if rect is None:
+        return None
+    crop = _scene.background.crop(rect)
+    crop = _scene.draw(crop, rect[:2], i / fps)
+    return rect, crop.tobytes()
+
+
+def render_clip(name, fps=30, seconds=2.0, workers=None):
+    """Return the list of RGBA frames for scene `name` and the dirty-pixel ratio."""
+    n = int(round(fps * seconds))
+    jobs = [(i, fps) for i in range(n)]
+    pool = None
+    if workers == 0:
+        _init_worker(name)
+        scene = _scene
+        crops = map(_render_frame, jobs)
+    else:
+        scene = SCENES[name]()
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(name,))
+        crops = pool.map(_render_frame, jobs, chunksize=max(1, n // (4 * (workers or os.cpu_count()))))
+    canvas = scene.background.copy()
+    frames, dirty = [], 0
+    try:
+        for result in crops:
+            if result is not None:
+                rect, data = result
+                size = (rect[2] - rect[0], rect[3] - rect[1])
+                canvas.paste(Image.frombytes("RGBA", size, data), rect[:2])
+                dirty += size[0] * size[1]
+            frames.append(canvas.convert("RGB"))
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return frames, dirty / (n * canvas.width * canvas.height)
+
+
+def save_animation(sink, frames, fps, stem):
+    duration = int(round(1000 / fps))
+    output_sink.save_image(sink, f"{stem}.png", frames[0], "PNG", save_all=True,
+                           append_images=frames[1:], duration=duration, loop=0)
+    gif = [f.quantize(256, method=Image.Quantize.MEDIANCUT) for f in frames]
+    output_sink.save_image(sink, f"{stem}.gif", gif[0], "GIF", save_all=True,
+                           append_images=gif[1:], duration=duration, loop=0, optimize=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Animated preview renderer")
+    parser.add_argument("scenes", nargs="*", default=list(SCENES), choices=list(SCENES))
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="render processes (default: CPU count, 0 = in-process)")
+    parser.add_argument("--out", default=os.path.dirname(os.path.abspath(__file__)),
+                        help="output directory, or a .zip/.tar/.tar.gz archive to stream into")
+    args = parser.parse_args()
+
+    with output_sink.open_sink(args.out) as sink:
+        for name in args.scenes:
+            t0 = time.perf_counter()
+            frames, ratio = render_clip(name, args.fps, args.seconds, args.workers)
+            t1 = time.perf_counter()
+            save_animation(sink, frames, args.fps, f"preview_{name}")
+            t2 = time.perf_counter()
+            print(f"preview_{name}: {len(frames)} frames, {100 * ratio:.1f}% of pixels redrawn, "
+                  f"render {t1 - t0:.2f}s, encode {t2 - t1:.2f}s")
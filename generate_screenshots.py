@@ -3,17 +3,55 @@
 Generate promotional screenshots for the Stamp Card app (スタンプカードアプリ).
 Produces 4 PNG images (520×1120px) faithfully matching the app's visual style.
 
-Usage: python3 generate_screenshots.py
-Output: screenshot_01_home.png .. screenshot_04_reward.png
+Each screenshot is recorded once as a display list (see display_list.py) and
+replayed per requested scale, so @2x/@3x renders reuse the same layout.
+
+Rendering and PNG encoding run as a two-stage pipeline: render workers fill a
+bounded queue that encoder threads drain (zlib releases the GIL), so encoding
+overlaps rendering while at most --queue-size frames wait in memory.
+
+--draft is for layout iteration: the same display lists are replayed at half
+scale with simplified primitives (no shadows, solid slot rings, flat buttons,
+aliased text) and encoded with the fastest PNG settings into draft/, so every
+element lands where the final render puts it, at a fraction of the cost.
+
+Usage: python3 generate_screenshots.py [--out DIR|FILE.zip|FILE.tar.gz] [--scale 1 2 3]
+                                       [--encoders N] [--queue-size N] [--draft]
+Output: screenshot_01_home.png .. screenshot_04_reward.png (+ @Nx variants)
 """
 
+import argparse
 import math
-import random
 import os
-from PIL import Image, ImageDraw, ImageFont
+import queue
+import threading
+import time
+import numpy as np
+from PIL import Image, ImageDraw
+
+from display_list import DisplayList
+
+import display_list
+import output_sink
+import particles
+import render_cache
+import render_context
+import sdf
+import shaders
+import shadow
 
 # ── Dimensions ──
 W, H = 520, 1120
+DRAFT_SCALE = 0.5  # --draft replays every requested scale at this fraction
+STAMP_BUTTON_W = 280
+REWARD_BUTTON_W = 240
+BUTTON_PADDING = 24  # per side; button labels shrink to fit inside it
+
+
+def button_text_width(button_w):
+    """Width a button label may take before draw_button shrinks it."""
+    return button_w - 2 * BUTTON_PADDING
+
 
 # ── Colors (from constants/colors.ts) ──
 PRIMARY      = "#5BC8F5"
@@ -41,7 +79,11 @@ CONFETTI     = ["#FF9DD2", "#5BC8F5", "#FFE66D", "#FFA559", "#7BC67E", "#BA68C8"
 FONT_PATH = "/System/Library/Fonts/Hiragino Sans GB.ttc"
 
 def font(size):
-    return ImageFont.truetype(FONT_PATH, size)
+    return render_context.current().font(FONT_PATH, size)
+
+def fonts():
+    """FONT_PATH plus per-codepoint fallbacks for emoji/symbols in mixed strings."""
+    return render_context.current().chain("sans", FONT_PATH)
 
 def hex_to_rgb(h):
     h = h.lstrip("#")
@@ -52,15 +94,15 @@ def hex_to_rgba(h, a=255):
 
 # ── Drawing helpers ──
 
-def gradient_rect(img, box, color_top, color_bottom):
-    """Fill a rectangle with a vertical gradient."""
+def gradient_rect(draw, box, color_top, color_bottom):
+    """Fill a rectangle with a vertical gradient, one row at a time."""
     x0, y0, x1, y1 = box
     for y in range(y0, y1):
         t = (y - y0) / max(1, y1 - y0 - 1)
         r = int(color_top[0] + (color_bottom[0] - color_top[0]) * t)
         g = int(color_top[1] + (color_bottom[1] - color_top[1]) * t)
         b = int(color_top[2] + (color_bottom[2] - color_top[2]) * t)
-        ImageDraw.Draw(img).line([(x0, y), (x1, y)], fill=(r, g, b))
+        draw.rectangle([x0, y, x1, y], fill=(r, g, b))
 
 def draw_rounded_rect(draw, box, radius, fill=None, outline=None, width=1):
     """Draw a rounded rectangle."""
@@ -134,7 +176,18 @@ def draw_star_character(draw, cx, cy, size=40):
     draw.arc([cx - mouth_w, mouth_y - mouth_w // 2, cx + mouth_w, mouth_y + mouth_w],
              start=0, end=180, fill=(51, 51, 51), width=max(1, size // 20))
 
-def draw_stamp_slot(draw, cx, cy, cell_size, filled=False):
+def star_points(cx, cy, star_r, inner=0.45):
+    """Vertices of the 5-point stamp star."""
+    points = []
+    for i in range(5):
+        angle = math.radians(-90 + i * 72)
+        points.append((cx + int(star_r * math.cos(angle)), cy + int(star_r * math.sin(angle))))
+        angle2 = math.radians(-90 + i * 72 + 36)
+        points.append((cx + int(star_r * inner * math.cos(angle2)),
+                       cy + int(star_r * inner * math.sin(angle2))))
+    return points
+
+def draw_stamp_slot(draw, cx, cy, cell_size, filled=False, dashed=True):
     """Draw a single stamp slot (empty with dashed border, or filled with star)."""
     r = cell_size // 2
     if filled:
@@ -143,19 +196,11 @@ def draw_stamp_slot(draw, cx, cy, cell_size, filled=False):
         draw_circle(draw, cx, cy, r, outline=hex_to_rgb(STAMP_EMPTY), fill=None)
         # Draw star emoji-like shape
         star_r = int(cell_size * 0.35)
-        points = []
-        for i in range(5):
-            angle = math.radians(-90 + i * 72)
-            ox = cx + int(star_r * math.cos(angle))
-            oy = cy + int(star_r * math.sin(angle))
-            points.append((ox, oy))
-            angle2 = math.radians(-90 + i * 72 + 36)
-            ix = cx + int(star_r * 0.45 * math.cos(angle2))
-            iy = cy + int(star_r * 0.45 * math.sin(angle2))
-            points.append((ix, iy))
-        draw.polygon(points, fill=hex_to_rgb(STAMP_FILLED))
+        draw.polygon(star_points(cx, cy, star_r), fill=hex_to_rgb(STAMP_FILLED))
         # Shine
         draw_circle(draw, cx - star_r // 3, cy - star_r // 3, max(1, star_r // 6), fill=(255, 255, 255, 180))
+    elif not dashed:
+        draw_circle(draw, cx, cy, r, fill=hex_to_rgb("#F0F9FF"), outline=hex_to_rgb(STAMP_EMPTY))
     else:
         # Empty: dashed circle
         draw_circle(draw, cx, cy, r, fill=hex_to_rgb("#F0F9FF"))
@@ -169,80 +214,217 @@ def draw_stamp_slot(draw, cx, cy, cell_size, filled=False):
             y2 = cy + r * math.sin(a2)
             draw.line([(x1, y1), (x2, y2)], fill=hex_to_rgb(STAMP_EMPTY), width=2)
 
-def draw_button(img, draw, box, text, gradient_colors, text_size=22):
+def draw_stamp_slots(img, slots, cell_size, filled):
+    """Draw all stamp slots at once with anti-aliased SDF rings.
+
+    One batched call draws every slot circle (dashed ring when empty, thin
+    solid ring when filled); the stars go on top, then one more batch for the
+    shine dots. Matches draw_stamp_slot() slot for slot.
+    """
+    if not slots:
+        return
+    r = cell_size // 2
+    filled = np.array([bool(f) for f in filled] + [False] * (len(slots) - len(filled)))[:len(slots)]
+    # PIL ellipse boxes are inclusive, so a radius-r circle spans 2r+1 pixels
+    xs = np.array([cx for cx, _ in slots]) + 0.5
+    ys = np.array([cy for _, cy in slots]) + 0.5
+    sdf.draw_shapes(img, xs, ys, r + 0.5, fill="#F0F9FF", stroke=STAMP_EMPTY,
+                    stroke_width=np.where(filled, 1, 2),
+                    dash=(np.where(filled, np.inf, (r + 0.5) * math.radians(8)),
+                          np.where(filled, 0, (r + 0.5) * math.radians(7))))
+    if not filled.any():
+        return
+    draw = ImageDraw.Draw(img)
+    star_r = int(cell_size * 0.35)
+    for (cx, cy), f in zip(slots, filled):
+        if f:
+            draw.polygon(star_points(cx, cy, star_r), fill=hex_to_rgb(STAMP_FILLED))
+    shine = max(1, star_r // 6)
+    sdf.draw_shapes(img, xs[filled] - star_r // 3, ys[filled] - star_r // 3, shine + 0.5,
+                    fill=(255, 255, 255, 180))
+
+def _paint_button(img, s, box, gradient_colors):
+    """Raster op for draw_button(): masked gradient pill with a white glow."""
+    x0, y0, x1, y1 = display_list.scale_box(box, s)
+    w, h = x1 - x0, y1 - y0
+    radius = h // 2
+    # Gradient fill, button-sized
+    face = Image.new("RGBA", (w + 1, h + 1), (0, 0, 0, 0))
+    gradient_rect(ImageDraw.Draw(face), (0, 0, w, h + 1), hex_to_rgb(gradient_colors[0]),
+                  hex_to_rgb(gradient_colors[1]))
+    # Glow overlay
+    glow = Image.new("RGBA", face.size, (0, 0, 0, 0))
+    ImageDraw.Draw(glow).rounded_rectangle([0, 0, w, h], radius=radius, fill=(255, 255, 255, 48))
+    face = Image.alpha_composite(face, glow)
+    # Round the corners by masking
+    mask = Image.new("L", face.size, 0)
+    ImageDraw.Draw(mask).rounded_rectangle([0, 0, w, h], radius=radius, fill=255)
+    img.paste(face, (x0, y0), mask)
+
+def _paint_button_draft(img, s, box, gradient_colors):
+    """Draft stand-in for _paint_button(): a flat pill in the gradient's mid color."""
+    top, bottom = hex_to_rgb(gradient_colors[0]), hex_to_rgb(gradient_colors[1])
+    x0, y0, x1, y1 = display_list.scale_box(box, s)
+    ImageDraw.Draw(img).rounded_rectangle([x0, y0, x1, y1], radius=(y1 - y0) // 2,
+                                          fill=tuple((a + b) // 2 for a, b in zip(top, bottom)))
+
+def draw_button(dl, box, text, gradient_colors, text_size=22):
     """Draw a rounded gradient button with text."""
     x0, y0, x1, y1 = box
-    radius = (y1 - y0) // 2
-    # Gradient fill
-    gradient_rect(img, box, hex_to_rgb(gradient_colors[0]), hex_to_rgb(gradient_colors[1]))
-    # Round the corners by masking
-    mask = Image.new("L", img.size, 0)
-    mask_draw = ImageDraw.Draw(mask)
-    mask_draw.rounded_rectangle(box, radius=radius, fill=255)
-    # Apply mask
-    bg = img.copy()
-    flat = Image.new("RGBA", img.size, (0, 0, 0, 0))
-    flat.paste(img, mask=mask)
-    # Glow overlay
-    glow = Image.new("RGBA", img.size, (0, 0, 0, 0))
-    glow_draw = ImageDraw.Draw(glow)
-    glow_draw.rounded_rectangle(box, radius=radius, fill=(255, 255, 255, 48))
-    flat = Image.alpha_composite(flat, glow)
-    # Composite back
-    bg.paste(flat, mask=mask)
-    img.paste(bg)
-    # Text
-    f = font(text_size)
-    draw = ImageDraw.Draw(img)
-    bbox = f.getbbox(text)
+    soft_shadow(dl, box, (y1 - y0) // 2, blur=12, offset=(0, 4), opacity=0.2)
+    dl.raster(_paint_button, box, gradient_colors, bounds=(x0, y0, x1 + 1, y1 + 1),
+              draft=_paint_button_draft)
+    # Text, shrunk to fit inside the pill's padding if a translation runs long
+    text_size = fonts().fit(text, button_text_width(x1 - x0), text_size)
+    bbox = fonts().bbox(text, text_size)
     tw = bbox[2] - bbox[0]
     th = bbox[3] - bbox[1]
     tx = (x0 + x1 - tw) // 2
     ty = (y0 + y1 - th) // 2 - bbox[1]
     # Shadow
-    draw.text((tx + 1, ty + 1), text, fill=(0, 0, 0, 48), font=f)
-    draw.text((tx, ty), text, fill=(255, 255, 255), font=f)
+    chain_text(dl, (tx + 1, ty + 1), text, text_size, fill=(0, 0, 0, 48))
+    chain_text(dl, (tx, ty), text, text_size, fill=(255, 255, 255))
 
-def draw_header(draw, star_count, show_settings=True):
+def draw_header(dl, star_count, show_settings=True):
     """Draw the header bar with star count and settings."""
     y = 60
     # Star count (left)
-    f_icon = font(20)
     f_count = font(18)
-    draw.text((30, y), "⭐", font=f_icon, fill=(0, 0, 0))
-    draw.text((55, y + 2), str(star_count), font=f_count, fill=hex_to_rgb(TEXT_DARK))
+    chain_text(dl, (30, y), "⭐", 20, fill=(0, 0, 0))
+    dl.text((55, y + 2), str(star_count), font=f_count, fill=hex_to_rgb(TEXT_DARK))
     # Settings (right)
     if show_settings:
         f_settings = font(14)
-        draw.text((W - 120, y), "⚙️", font=f_icon, fill=(0, 0, 0))
-        draw.text((W - 95, y + 4), "せってい", font=f_settings, fill=hex_to_rgb(TEXT_LIGHT))
+        chain_text(dl, (W - 120, y), "⚙️", 20, fill=(0, 0, 0))
+        dl.text((W - 95, y + 4), "せってい", font=f_settings, fill=hex_to_rgb(TEXT_LIGHT))
+
+def _render_base_bg(scale=1.0):
+    dl = DisplayList((W, H))
+    gradient_rect(dl, (0, 0, W, H), hex_to_rgb(BG_TOP), hex_to_rgb(BG_BOTTOM))
+    # Clouds
+    draw_cloud(dl, W - 130, 50, scale=0.9)
+    draw_cloud(dl, -20, H - 200, scale=0.7)
+    return dl.replay(scale)
 
-def make_base_bg():
+def make_base_bg(scale=1.0):
     """Create base image with sky gradient background."""
-    img = Image.new("RGBA", (W, H), (0, 0, 0, 0))
-    gradient_rect(img, (0, 0, W, H), hex_to_rgb(BG_TOP), hex_to_rgb(BG_BOTTOM))
+    return render_cache.cached_image("base_bg", (W, H, BG_TOP, BG_BOTTOM, scale),
+                                     lambda: _render_base_bg(scale),
+                                     code=(_render_base_bg, gradient_rect, draw_cloud,
+                                           display_list.DisplayList))
+
+# ── Raster ops (recorded with DisplayList.raster, replayed at any scale) ──
+
+def _paint_base_bg(img, s):
+    return make_base_bg(s)
+
+def _paint_chain_text(img, s, xy, text, size, fill, aliased=False):
+    fonts().draw(img, display_list.scale_point(xy, s), text, round(size * s), fill=fill,
+                 aliased=aliased)
+
+def _paint_chain_text_draft(img, s, xy, text, size, fill):
+    _paint_chain_text(img, s, xy, text, size, fill, aliased=True)
+
+def chain_text(dl, xy, text, size, fill):
+    """Record font-chain text (emoji, mixed scripts) at top-left `xy`."""
+    l, t, r, b = fonts().bbox(text, size)
+    dl.raster(_paint_chain_text, xy, text, size, fill,
+              bounds=(xy[0] + l - 2, xy[1] + t - 2, xy[0] + r + 2, xy[1] + b + 2),
+              draft=_paint_chain_text_draft)
+
+def _paint_particles(img, s, p):
+    if s != 1:
+        p = p.copy()
+        p.x *= s
+        p.y *= s
+        p.w *= s
+        p.h *= s
+    return particles.rasterize(img, p)
+
+def _paint_shadow(img, s, box, radius, blur, offset, opacity):
+    shadow.drop_shadow(img, display_list.scale_box(box, s), radius * s, blur * s,
+                       offset=(offset[0] * s, offset[1] * s), opacity=opacity)
+
+def soft_shadow(dl, box, radius, blur=12, offset=(0, 4), opacity=0.2):
+    """Record a blurred drop shadow under the rounded rect `box`."""
+    x0, y0, x1, y1 = box
+    pad = shadow.padding(blur)
+    dl.raster(_paint_shadow, box, radius, blur, offset, opacity,
+              bounds=(x0 + offset[0] - pad, y0 + offset[1] - pad,
+                      x1 + offset[0] + pad + 1, y1 + offset[1] + pad + 1),
+              draft=display_list.skip)
+
+def _paint_stamp_slots(img, s, slots, cell_size, filled):
+    draw_stamp_slots(img, [display_list.scale_point(p, s) for p in slots],
+                     round(cell_size * s), filled)
+
+def _paint_stamp_slots_draft(img, s, slots, cell_size, filled):
     draw = ImageDraw.Draw(img)
-    # Clouds
-    draw_cloud(draw, W - 130, 50, scale=0.9)
-    draw_cloud(draw, -20, H - 200, scale=0.7)
-    return img
+    for i, (cx, cy) in enumerate(slots):
+        cx, cy = display_list.scale_point((cx, cy), s)
+        draw_stamp_slot(draw, cx, cy, round(cell_size * s), i < len(filled) and filled[i],
+                        dashed=False)
 
-def draw_main_card(img, draw, stamps, total_goal=12):
-    """Draw the main stamp card with stamps grid."""
+def _paint_shapes(img, s, cx, cy, hw, hh, corner, fill):
+    sdf.draw_shapes(img, np.asarray(cx) * s, np.asarray(cy) * s, np.asarray(hw) * s,
+                    np.asarray(hh) * s, corner=corner * s, fill=fill)
+
+def stamp_grid_layout(total_goal, card_w, grid_top):
+    """Return ([(cx, cy), ...], cell_size) for the stamp slots below `grid_top`."""
+    grid_cols = 4  # for goal=12
+    if total_goal <= 5:
+        grid_cols = 3
+    elif total_goal <= 8:
+        grid_cols = 4
+    else:
+        grid_cols = 4
+
+    cell_size = min(60, max(44, (card_w - 60 - (grid_cols - 1) * 10) // grid_cols))
+    gap = 10
+    grid_y = grid_top + 50
+
+    slots = []
+    for i in range(total_goal):
+        col = i % grid_cols
+        row = i // grid_cols
+        # Center last row if it has fewer items
+        row_count = min(grid_cols, total_goal - row * grid_cols)
+        row_w = row_count * cell_size + (row_count - 1) * gap
+        row_x = (W - row_w) // 2
+        cx = row_x + col * (cell_size + gap) + cell_size // 2
+        cy = grid_y + row * (cell_size + gap) + cell_size // 2
+        slots.append((cx, cy))
+    return slots, cell_size
+
+MAIN_CARD_BANNER = "すたんぷをあつめよう"
+
+def main_card_layout(total_goal=12):
+    """Geometry of draw_main_card(): card box, task banner and stamp slots."""
     card_w = int(W * 0.85)
     card_x = (W - card_w) // 2
     card_y = 140
-    card_h = 520  # Approximate
+    bb = font(14).getbbox(MAIN_CARD_BANNER)
+    bw = bb[2] - bb[0] + 40
+    bh = bb[3] - bb[1] + 12
+    banner = ((W - bw) // 2, card_y + 90, bw, bh)
+    slots, cell_size = stamp_grid_layout(total_goal, card_w, banner[1] + bh)
+    return {"card": (card_x, card_y, card_w, 520), "banner": banner,  # height approximate
+            "slots": slots, "cell_size": cell_size}
+
+def main_card_slots(total_goal=12):
+    """Stamp slot centers and cell size as laid out by draw_main_card()."""
+    layout = main_card_layout(total_goal)
+    return layout["slots"], layout["cell_size"]
+
+def draw_main_card(draw, stamps, total_goal=12):
+    """Draw the main stamp card with stamps grid."""
+    layout = main_card_layout(total_goal)
+    card_x, card_y, card_w, card_h = layout["card"]
     card_r = card_w // 2
 
     # Card shadow
-    shadow = Image.new("RGBA", img.size, (0, 0, 0, 0))
-    s_draw = ImageDraw.Draw(shadow)
-    s_draw.rounded_rectangle([card_x + 3, card_y + 6, card_x + card_w - 3, card_y + card_h],
-                              radius=card_r, fill=(0, 0, 0, 25))
-    img_temp = Image.alpha_composite(img, shadow)
-    img.paste(img_temp)
-    draw = ImageDraw.Draw(img)
+    soft_shadow(draw, [card_x, card_y, card_x + card_w, card_y + card_h], card_r,
+                blur=24, offset=(0, 8), opacity=0.15)
 
     # Card body
     draw.rounded_rectangle([card_x, card_y, card_x + card_w, card_y + card_h],
@@ -254,16 +436,11 @@ def draw_main_card(img, draw, stamps, total_goal=12):
     draw_rainbow(draw, rainbow_cx, rainbow_cy)
 
     # Task banner
-    banner_text = "すたんぷをあつめよう"
-    f_banner = font(14)
-    bb = f_banner.getbbox(banner_text)
-    bw = bb[2] - bb[0] + 40
-    bh = bb[3] - bb[1] + 12
-    banner_x = (W - bw) // 2
-    banner_y = card_y + 90
+    banner_x, banner_y, bw, bh = layout["banner"]
     draw.rounded_rectangle([banner_x, banner_y, banner_x + bw, banner_y + bh],
                            radius=15, fill=hex_to_rgb(PINK_BG))
-    draw.text((banner_x + 20, banner_y + 4), banner_text, font=f_banner, fill=hex_to_rgb(PINK_TEXT))
+    draw.text((banner_x + 20, banner_y + 4), MAIN_CARD_BANNER, font=font(14),
+              fill=hex_to_rgb(PINK_TEXT))
 
     # Task name
     f_task = font(20)
@@ -273,31 +450,12 @@ def draw_main_card(img, draw, stamps, total_goal=12):
     draw.text(((W - tw) // 2, banner_y + bh + 6), task_text, font=f_task, fill=hex_to_rgb(TEXT_DARK))
 
     # Stamp grid
-    grid_cols = 4  # for goal=12
-    if total_goal <= 5:
-        grid_cols = 3
-    elif total_goal <= 8:
-        grid_cols = 4
-    else:
-        grid_cols = 4
-
-    cell_size = min(60, max(44, (card_w - 60 - (grid_cols - 1) * 10) // grid_cols))
-    gap = 10
-    grid_w = grid_cols * cell_size + (grid_cols - 1) * gap
-    grid_x = (W - grid_w) // 2
-    grid_y = banner_y + bh + 50
-
-    for i in range(total_goal):
-        col = i % grid_cols
-        row = i // grid_cols
-        # Center last row if it has fewer items
-        row_count = min(grid_cols, total_goal - row * grid_cols)
-        row_w = row_count * cell_size + (row_count - 1) * gap
-        row_x = (W - row_w) // 2
-        cx = row_x + col * (cell_size + gap) + cell_size // 2
-        cy = grid_y + row * (cell_size + gap) + cell_size // 2
-        if col < row_count:
-            draw_stamp_slot(draw, cx, cy, cell_size, filled=stamps[i] if i < len(stamps) else False)
+    slots, cell_size = layout["slots"], layout["cell_size"]
+    r = cell_size // 2 + 1
+    draw.raster(_paint_stamp_slots, slots, cell_size, stamps,
+                bounds=(min(x for x, _ in slots) - r, min(y for _, y in slots) - r,
+                        max(x for x, _ in slots) + r + 1, max(y for _, y in slots) + r + 1),
+                draft=_paint_stamp_slots_draft)
 
     # Star character on card (left side)
     draw_star_character(draw, card_x + 35, card_y + 250, size=35)
@@ -365,57 +523,39 @@ def draw_puppy(draw, cx, cy, scale=1.0):
     draw.ellipse([cx - tw//2, cy + int(20*s), cx + tw//2, cy + int(20*s) + th],
                  fill=hex_to_rgb("#FF8FAB"))
 
-def draw_confetti(draw, count=40):
-    """Draw confetti pieces across the screen."""
-    random.seed(42)  # Deterministic for reproducibility
-    for _ in range(count):
-        x = random.randint(0, W)
-        y = random.randint(0, H - 200)
-        w = random.randint(8, 14)
-        h = random.randint(4, 7)
-        color = hex_to_rgb(random.choice(CONFETTI))
-        angle = random.randint(0, 180)
-        # Simple rectangle confetti
-        draw.rounded_rectangle([x, y, x + w, y + h], radius=2, fill=color)
-
-def draw_sun_rays(img, cx, cy):
-    """Draw radiating sun rays."""
-    overlay = Image.new("RGBA", img.size, (0, 0, 0, 0))
-    od = ImageDraw.Draw(overlay)
-    num_rays = 12
-    ray_len = W * 1.5
-    for i in range(num_rays):
-        angle = math.radians(i * (360 / num_rays))
-        angle2 = math.radians(i * (360 / num_rays) + 8)
-        x1 = cx + ray_len * math.cos(angle)
-        y1 = cy + ray_len * math.sin(angle)
-        x2 = cx + ray_len * math.cos(angle2)
-        y2 = cy + ray_len * math.sin(angle2)
-        od.polygon([(cx, cy), (x1, y1), (x2, y2)], fill=(255, 255, 255, 38))
-    return Image.alpha_composite(img, overlay)
+def draw_confetti(dl, count=40, seed=42):
+    """Draw rotated confetti pieces across the screen."""
+    rng = np.random.default_rng(seed)  # Deterministic for reproducibility
+    pieces = particles.scatter_confetti(rng, count, (0, 0, W, H - 200), CONFETTI)
+    dl.raster(_paint_particles, pieces)
+
+def _paint_effects(img, s, effects, roi):
+    shaders.render(img, effects, roi, scale=s)
+
+def draw_sun_rays(dl, cx, cy):
+    """Draw 12 soft-edged radiating sun rays over the whole canvas."""
+    dl.raster(_paint_effects, [shaders.rays((cx, cy), 12, 8, (255, 255, 255, 38), softness=1.5)], None)
 
 
 # ══════════════════════════════════════════════════════════
 # Screenshot 1: Home screen (empty)
 # ══════════════════════════════════════════════════════════
 
-def generate_screenshot_01():
-    img = make_base_bg()
-    draw = ImageDraw.Draw(img)
+def record_screenshot_01():
+    draw = DisplayList((W, H))
+    draw.raster(_paint_base_bg)
 
     draw_header(draw, star_count=0)
 
     stamps = [False] * 12
-    card_bottom = draw_main_card(img, draw, stamps, total_goal=12)
-    draw = ImageDraw.Draw(img)
+    card_bottom = draw_main_card(draw, stamps, total_goal=12)
 
     # Button
     btn_y = card_bottom + 20
-    btn_w = 280
+    btn_w = STAMP_BUTTON_W
     btn_h = 56
-    draw_button(img, draw, ((W - btn_w) // 2, btn_y, (W + btn_w) // 2, btn_y + btn_h),
+    draw_button(draw, ((W - btn_w) // 2, btn_y, (W + btn_w) // 2, btn_y + btn_h),
                 "スタンプをゲット！", [PRIMARY, PRIMARY_DARK])
-    draw = ImageDraw.Draw(img)
 
     # Remaining banner
     draw_remaining_banner(draw, 12, btn_y + btn_h + 16)
@@ -423,78 +563,66 @@ def generate_screenshot_01():
     # Star character bottom-left
     draw_star_character(draw, 45, H - 100, size=30)
 
-    return img
+    return draw
 
 
 # ══════════════════════════════════════════════════════════
 # Screenshot 2: Progress (7/12 stamps collected)
 # ══════════════════════════════════════════════════════════
 
-def generate_screenshot_02():
-    img = make_base_bg()
-    draw = ImageDraw.Draw(img)
+def record_screenshot_02(filled=7, burst=True):
+    draw = DisplayList((W, H))
+    draw.raster(_paint_base_bg)
 
-    draw_header(draw, star_count=7)
+    draw_header(draw, star_count=filled)
 
-    stamps = [True] * 7 + [False] * 5
-    card_bottom = draw_main_card(img, draw, stamps, total_goal=12)
-    draw = ImageDraw.Draw(img)
+    stamps = [True] * filled + [False] * (12 - filled)
+    card_bottom = draw_main_card(draw, stamps, total_goal=12)
 
     # Button
     btn_y = card_bottom + 20
-    btn_w = 280
+    btn_w = STAMP_BUTTON_W
     btn_h = 56
-    draw_button(img, draw, ((W - btn_w) // 2, btn_y, (W + btn_w) // 2, btn_y + btn_h),
+    draw_button(draw, ((W - btn_w) // 2, btn_y, (W + btn_w) // 2, btn_y + btn_h),
                 "スタンプをゲット！", [PRIMARY, PRIMARY_DARK])
-    draw = ImageDraw.Draw(img)
 
     # Remaining banner
-    draw_remaining_banner(draw, 5, btn_y + btn_h + 16)
+    draw_remaining_banner(draw, 12 - filled, btn_y + btn_h + 16)
 
     # Star character bottom-left
     draw_star_character(draw, 45, H - 100, size=30)
 
     # Particle burst on last stamp (decorative)
-    colors = ["#FFD700", "#FF6B6B", "#5BC8F5", "#7BC67E", "#FF9DD2"]
-    random.seed(7)
-    for i, c in enumerate(colors):
-        angle = (i / 5) * math.pi * 2
-        dist = 25
-        px = 315 + int(math.cos(angle) * dist)
-        py = 420 + int(math.sin(angle) * dist)
-        draw_circle(draw, px, py, 5, fill=hex_to_rgb(c))
+    if burst:
+        colors = ["#FFD700", "#FF6B6B", "#5BC8F5", "#7BC67E", "#FF9DD2"]
+        rng = np.random.default_rng(7)
+        draw.raster(_paint_particles, particles.burst(rng, 5, (315, 420), 25, colors, size=10))
 
-    return img
+    return draw
 
 
 # ══════════════════════════════════════════════════════════
 # Screenshot 3: Settings modal
 # ══════════════════════════════════════════════════════════
 
-def generate_screenshot_03():
-    img = make_base_bg()
-    draw = ImageDraw.Draw(img)
+def record_screenshot_03():
+    draw = DisplayList((W, H))
+    draw.raster(_paint_base_bg)
 
     draw_header(draw, star_count=7)
 
     stamps = [True] * 7 + [False] * 5
-    card_bottom = draw_main_card(img, draw, stamps, total_goal=12)
-    draw = ImageDraw.Draw(img)
+    card_bottom = draw_main_card(draw, stamps, total_goal=12)
 
     # Button (behind modal)
     btn_y = card_bottom + 20
-    btn_w = 280
+    btn_w = STAMP_BUTTON_W
     btn_h = 56
-    draw_button(img, draw, ((W - btn_w) // 2, btn_y, (W + btn_w) // 2, btn_y + btn_h),
+    draw_button(draw, ((W - btn_w) // 2, btn_y, (W + btn_w) // 2, btn_y + btn_h),
                 "スタンプをゲット！", [PRIMARY, PRIMARY_DARK])
-    draw = ImageDraw.Draw(img)
 
     # Dark overlay
-    overlay = Image.new("RGBA", img.size, (0, 0, 0, 0))
-    od = ImageDraw.Draw(overlay)
-    od.rectangle([0, 0, W, H], fill=(0, 0, 0, 96))
-    img = Image.alpha_composite(img, overlay)
-    draw = ImageDraw.Draw(img)
+    draw.layer().rectangle([0, 0, W, H], fill=MODAL_OVERLAY)
 
     # Modal bottom sheet
     modal_y = H - 480
@@ -508,11 +636,10 @@ def generate_screenshot_03():
                            radius=2, fill=hex_to_rgb("#CCCCCC"))
 
     # Title
-    f_title = font(22)
     title = "⚙️ せってい"
-    tb = f_title.getbbox(title)
+    tb = fonts().bbox(title, 22)
     tw = tb[2] - tb[0]
-    draw.text(((W - tw) // 2, modal_y + 30), title, font=f_title, fill=hex_to_rgb(TEXT_DARK))
+    chain_text(draw, ((W - tw) // 2, modal_y + 30), title, 22, fill=hex_to_rgb(TEXT_DARK))
 
     # Section: スタンプのかず
     f_section = font(16)
@@ -529,15 +656,18 @@ def generate_screenshot_03():
     grid_y_start = modal_y + 110
 
     f_goal = font(18)
-    for idx, g in enumerate(goals):
-        col = idx % cols
-        row = idx // cols
-        bx = grid_x + col * (btn_size + gap)
-        by = grid_y_start + row * (btn_h_g + gap)
+    cells = [(grid_x + (idx % cols) * (btn_size + gap), grid_y_start + (idx // cols) * (btn_h_g + gap))
+             for idx in range(len(goals))]
+    # All goal buttons in one SDF batch (inclusive PIL boxes are size+1 wide)
+    draw.raster(_paint_shapes, [bx + (btn_size + 1) / 2 for bx, _ in cells],
+                [by + (btn_h_g + 1) / 2 for _, by in cells],
+                (btn_size + 1) / 2, (btn_h_g + 1) / 2, 12,
+                [ORANGE if g == 12 else "#F0F0F0" for g in goals],
+                bounds=(grid_x, grid_y_start, grid_x + grid_w + 1,
+                        grid_y_start + 2 * btn_h_g + gap + 1))
+    for (bx, by), g in zip(cells, goals):
         is_active = (g == 12)
-        bg_color = hex_to_rgb(ORANGE) if is_active else hex_to_rgb("#F0F0F0")
         txt_color = (255, 255, 255) if is_active else hex_to_rgb("#555555")
-        draw.rounded_rectangle([bx, by, bx + btn_size, by + btn_h_g], radius=12, fill=bg_color)
         gb = f_goal.getbbox(str(g))
         gw = gb[2] - gb[0]
         gh = gb[3] - gb[1]
@@ -549,11 +679,10 @@ def generate_screenshot_03():
     undo_h = 50
     draw.rounded_rectangle([24, undo_y, W - 24, undo_y + undo_h], radius=14,
                            fill=hex_to_rgb("#FFF0F0"))
-    f_undo = font(16)
     undo_text = "↩️ スタンプを1こもどす"
-    ub = f_undo.getbbox(undo_text)
+    ub = fonts().bbox(undo_text, 16)
     uw = ub[2] - ub[0]
-    draw.text(((W - uw) // 2, undo_y + 14), undo_text, font=f_undo, fill=hex_to_rgb(RED))
+    chain_text(draw, ((W - uw) // 2, undo_y + 14), undo_text, 16, fill=hex_to_rgb(RED))
 
     # Close button
     close_y = undo_y + undo_h + 16
@@ -566,24 +695,24 @@ def generate_screenshot_03():
     cw = cb[2] - cb[0]
     draw.text(((W - cw) // 2, close_y + 14), close_text, font=f_close, fill=(255, 255, 255))
 
-    return img
+    return draw
 
 
 # ══════════════════════════════════════════════════════════
 # Screenshot 4: Reward screen
 # ══════════════════════════════════════════════════════════
 
-def generate_screenshot_04():
-    img = Image.new("RGBA", (W, H), (0, 0, 0, 0))
+def record_screenshot_04(confetti=True):
+    draw = DisplayList((W, H))
     # Gradient: sky blue → light yellow
-    gradient_rect(img, (0, 0, W, H), hex_to_rgb(BG_TOP), hex_to_rgb("#FFE8A3"))
+    gradient_rect(draw, (0, 0, W, H), hex_to_rgb(BG_TOP), hex_to_rgb("#FFE8A3"))
 
     # Sun rays
-    img = draw_sun_rays(img, W // 2, H // 3)
-    draw = ImageDraw.Draw(img)
+    draw_sun_rays(draw, W // 2, H // 3)
 
     # Confetti
-    draw_confetti(draw, count=40)
+    if confetti:
+        draw_confetti(draw, count=40)
 
     # Title: ごほうび！
     f_title = font(64)
@@ -616,26 +745,176 @@ def generate_screenshot_04():
     # Badge background
     badge_w = aw + 40
     badge_h = 40
+    soft_shadow(draw, [(W - badge_w) // 2, achieve_y, (W + badge_w) // 2, achieve_y + badge_h], 20,
+                blur=10, offset=(0, 3), opacity=0.18)
     draw.rounded_rectangle([(W - badge_w) // 2, achieve_y, (W + badge_w) // 2, achieve_y + badge_h],
                            radius=20, fill=hex_to_rgba(STAMP_FILLED, 230))
     draw.text(((W - aw) // 2, achieve_y + 8), achieve_text, font=f_achieve, fill=(255, 255, 255))
 
     # "もどる" button
     btn_y = achieve_y + 80
-    btn_w = 240
+    btn_w = REWARD_BUTTON_W
     btn_h = 56
-    draw_button(img, draw, ((W - btn_w) // 2, btn_y, (W + btn_w) // 2, btn_y + btn_h),
+    draw_button(draw, ((W - btn_w) // 2, btn_y, (W + btn_w) // 2, btn_y + btn_h),
                 "🏠 もどる", [PRIMARY, ORANGE])
-    draw = ImageDraw.Draw(img)
 
     # Sparkle decorations
     sparkle_positions = [(80, 300), (W - 80, 350), (100, 550), (W - 100, 500),
                          (60, 750), (W - 60, 700)]
-    for sx, sy in sparkle_positions:
-        draw_circle(draw, sx, sy, 4, fill=hex_to_rgb(STAMP_FILLED))
-        draw_circle(draw, sx, sy, 2, fill=(255, 255, 255))
+    draw.raster(_paint_particles, particles.sparkles(sparkle_positions, (STAMP_FILLED, "#FFFFFF")))
+
+    return draw
 
-    return img
+
+def generate_screenshot_01(scale=1.0):
+    return record_screenshot_01().replay(scale)
+
+def generate_screenshot_02(filled=7, burst=True, scale=1.0):
+    return record_screenshot_02(filled, burst).replay(scale)
+
+def generate_screenshot_03(scale=1.0):
+    return record_screenshot_03().replay(scale)
+
+def generate_screenshot_04(confetti=True, scale=1.0):
+    return record_screenshot_04(confetti).replay(scale)
+
+
+SCREENSHOTS = [
+    ("screenshot_01_home.png", record_screenshot_01),
+    ("screenshot_02_progress.png", record_screenshot_02),
+    ("screenshot_03_settings.png", record_screenshot_03),
+    ("screenshot_04_reward.png", record_screenshot_04),
+]
+
+def render(filename, scale=1.0, draft=False):
+    """Headless render of one screenshot in its own RenderContext.
+
+    Safe to call from many threads at once. Returns the context, whose
+    canvas is the RGBA render; ctx.export() / ctx.png() hand the pixels to
+    the caller as a NumPy view or memoryview.
+    """
+    record = dict(SCREENSHOTS)[filename]
+    with render_context.RenderContext() as ctx:
+        ctx.canvas = record().replay(scale * DRAFT_SCALE if draft else scale, draft=draft)
+    return ctx
+
+# ══════════════════════════════════════════════════════════
+# Render → encode pipeline
+# ══════════════════════════════════════════════════════════
+
+def encode_screenshot(img, draft=False):
+    """Flatten onto white RGB (no alpha, smaller file) and encode an optimized PNG.
+
+    Drafts use the fastest zlib level instead.
+    """
+    img_rgb = Image.new("RGB", img.size, (255, 255, 255))
+    img_rgb.paste(img, mask=img.split()[3] if img.mode == "RGBA" else None)
+    if draft:
+        return output_sink.encode_image(img_rgb, "PNG", compress_level=1)
+    return output_sink.encode_image(img_rgb, "PNG", optimize=True)
+
+def run_pipeline(sink, recorders, scales=(1.0,), render_workers=1, encoders=2, queue_size=2,
+                 draft=False):
+    """Render every (filename, record) at every scale and write the PNGs to `sink`.
+
+    Render workers record each display list once and replay it per scale into
+    a bounded queue; encoder threads drain it. When the queue is full the
+    renderers block, so memory stays bounded. Returns per-stage stats: busy
+    seconds, worker count and (for render) seconds blocked on a full queue.
+    Each job records and replays inside its own RenderContext.
+    With draft=True every scale is replayed at DRAFT_SCALE of itself in draft
+    quality (file names keep the requested scale) and encoded fast.
+    """
+    tasks = queue.Queue()
+    for job in recorders:
+        tasks.put(job)
+    frames = queue.Queue(maxsize=max(1, queue_size))
+    write_lock = threading.Lock()  # archive sinks are not thread-safe
+    stats = {"render": {"busy": 0.0, "blocked": 0.0, "workers": render_workers},
+             "encode": {"busy": 0.0, "workers": encoders}}
+    errors = []
+
+    def render_worker():
+        busy = blocked = 0.0
+        while not errors:
+            try:
+                filename, record = tasks.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                with render_context.RenderContext():
+                    t0 = time.perf_counter()
+                    dl = record()
+                    spent = 0.0
+                    for scale in scales:
+                        img = dl.replay(scale * DRAFT_SCALE if draft else scale, draft=draft)
+                        name = filename if scale == 1 else filename.replace(".png", f"@{scale:g}x.png")
+                        t1 = time.perf_counter()
+                        busy += t1 - t0
+                        spent += t1 - t0
+                        frames.put((name, img))
+                        t0 = time.perf_counter()
+                        blocked += t0 - t1
+                st = dl.stats
+                print(f"Rendered {filename} in {spent * 1000:.0f} ms: {st['recorded']} ops, "
+                      f"{st['culled']} culled, {st['clipped']} clipped, {st['merged']} merged "
+                      f"→ {st['drawn']} drawn")
+            except Exception as e:
+                errors.append(e)
+        with write_lock:
+            stats["render"]["busy"] += busy
+            stats["render"]["blocked"] += blocked
+
+    def encode_worker():
+        busy = 0.0
+        while True:
+            item = frames.get()
+            if item is None:
+                break
+            if errors:
+                continue  # keep draining so renderers never block forever
+            try:
+                t0 = time.perf_counter()
+                name, img = item
+                data = encode_screenshot(img, draft)
+                with write_lock:
+                    path = sink.write(name, data)
+                spent = time.perf_counter() - t0
+                busy += spent
+                print(f"  ✓ Saved: {path} ({img.size[0]}x{img.size[1]}, "
+                      f"encoded in {spent * 1000:.0f} ms)")
+            except Exception as e:
+                errors.append(e)
+        with write_lock:
+            stats["encode"]["busy"] += busy
+
+    start = time.perf_counter()
+    encode_threads = [threading.Thread(target=encode_worker) for _ in range(encoders)]
+    render_threads = [threading.Thread(target=render_worker) for _ in range(render_workers)]
+    for t in encode_threads + render_threads:
+        t.start()
+    for t in render_threads:
+        t.join()
+    for _ in encode_threads:
+        frames.put(None)
+    for t in encode_threads:
+        t.join()
+    stats["wall"] = time.perf_counter() - start
+    if errors:
+        raise errors[0]
+    return stats
+
+def format_pipeline_stats(stats):
+    wall = stats["wall"]
+    lines = [f"pipeline: {wall:.2f}s wall"]
+    for stage in ("render", "encode"):
+        st = stats[stage]
+        util = st["busy"] / (wall * st["workers"]) if wall else 0.0
+        line = f"  {stage}: {st['busy']:.2f}s busy on {st['workers']} thread(s), {util:.0%} utilized"
+        if "blocked" in st:
+            line += f", {st['blocked']:.2f}s blocked on a full queue"
+        lines.append(line)
+    return "\n".join(lines)
 
 
 # ══════════════════════════════════════════════════════════
@@ -643,23 +922,29 @@ def generate_screenshot_04():
 # ══════════════════════════════════════════════════════════
 
 if __name__ == "__main__":
-    out_dir = os.path.dirname(os.path.abspath(__file__))
-
-    generators = [
-        ("screenshot_01_home.png", generate_screenshot_01),
-        ("screenshot_02_progress.png", generate_screenshot_02),
-        ("screenshot_03_settings.png", generate_screenshot_03),
-        ("screenshot_04_reward.png", generate_screenshot_04),
-    ]
-
-    for filename, gen_func in generators:
-        print(f"Generating {filename}...")
-        img = gen_func()
-        # Convert to RGB for PNG (remove alpha for smaller files)
-        img_rgb = Image.new("RGB", img.size, (255, 255, 255))
-        img_rgb.paste(img, mask=img.split()[3] if img.mode == "RGBA" else None)
-        path = os.path.join(out_dir, filename)
-        img_rgb.save(path, "PNG", optimize=True)
-        print(f"  ✓ Saved: {path}")
-
+    parser = argparse.ArgumentParser(description="Promotional screenshot generator")
+    parser.add_argument("--out", default=None,
+                        help="output directory, or a .zip/.tar/.tar.gz archive to stream into "
+                             "(default: next to this script, or draft/ with --draft)")
+    parser.add_argument("--scale", type=float, nargs="+", default=[1.0],
+                        help="replay each screenshot at these scales, e.g. 1 2 3 "
+                             "(scales other than 1 are saved with an @Nx suffix)")
+    parser.add_argument("--render-workers", type=int, default=1,
+                        help="render threads feeding the encode queue")
+    parser.add_argument("--encoders", type=int, default=2,
+                        help="PNG encoder threads draining the queue")
+    parser.add_argument("--queue-size", type=int, default=2,
+                        help="rendered frames allowed to wait for an encoder (backpressure)")
+    parser.add_argument("--draft", action="store_true",
+                        help="fast half-scale preview: simplified primitives, fast PNG encoding")
+    args = parser.parse_args()
+    root = os.path.dirname(os.path.abspath(__file__))
+    out = args.out or (os.path.join(root, "draft") if args.draft else root)
+
+    with output_sink.open_sink(out) as sink:
+        stats = run_pipeline(sink, SCREENSHOTS, args.scale,
+                             render_workers=max(1, args.render_workers),
+                             encoders=max(1, args.encoders), queue_size=args.queue_size,
+                             draft=args.draft)
+    print(format_pipeline_stats(stats))
     print("\nAll screenshots generated successfully!")
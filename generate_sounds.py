@@ -1,57 +1,166 @@
 #!/usr/bin/env python3
-"""Generate stamp card sound effects"""
+"""Generate stamp card sound effects
+
+Usage: python3 generate_sounds.py [--sprite] [--rate HZ] [--out DIR|FILE.zip|FILE.tar.gz]
+Output: assets/sounds/{stamp,complete,undo}.wav, or with --sprite a single
+        assets/sounds/sprite.wav plus sprite.json holding per-sound offsets.
+"""
+import argparse
+import json
+from functools import lru_cache
+
 import numpy as np
-from scipy.io import wavfile
-import os
 
-os.makedirs("assets/sounds", exist_ok=True)
+import output_sink
+import render_cache
+
+SOUNDS_DIR = "assets/sounds"
 SAMPLE_RATE = 44100
+SPRITE_GAP = 0.1  # seconds of silence between clips in the sprite
 
-def generate_stamp_sound():
+def make_stamp_sound(rate=SAMPLE_RATE):
     duration = 0.35
-    t = np.linspace(0, duration, int(SAMPLE_RATE * duration))
+    t = np.linspace(0, duration, int(rate * duration))
     freq_perc = 80 * np.exp(-t * 15)
     perc = np.sin(2 * np.pi * freq_perc * t) * np.exp(-t * 18)
     chin = np.sin(2 * np.pi * 880 * t) * np.exp(-t * 25) * 0.4
     charm = np.sin(2 * np.pi * 1320 * t) * np.exp(-t * 30) * 0.2
     combined = perc + chin + charm
-    combined = combined / np.max(np.abs(combined)) * 0.85
-    wavfile.write("assets/sounds/stamp.wav", SAMPLE_RATE, (combined * 32767).astype(np.int16))
-    print("stamp.wav")
+    return combined / np.max(np.abs(combined)) * 0.85
+
+# ── Sequencer ──
+# Voices are (length in seconds, fn(t, pitch)) rendered once per (voice, pitch,
+# rate) and shared by every event that plays them.
+
+def _chime(t, f):
+    """Arpeggio note: fundamental plus a faster-decaying octave."""
+    return np.sin(2 * np.pi * f * t) * np.exp(-t * 4) + np.sin(2 * np.pi * 2 * f * t) * np.exp(-t * 6) * 0.3
+
+def _sparkle(t, f):
+    return np.sin(2 * np.pi * f * t) * np.exp(-t * 20)
+
+VOICES = {
+    "chime": (1.2, _chime),
+    "sparkle": (0.15, _sparkle),
+}
+
+@lru_cache(maxsize=256)
+def voice_buffer(voice, pitch, rate=SAMPLE_RATE):
+    length, fn = VOICES[voice]
+    buf = fn(np.arange(int(rate * length)) / rate, pitch)
+    buf.flags.writeable = False
+    return buf
+
+def sequence(events, rate=SAMPLE_RATE, duration=None, loop=False):
+    """Mix timed (onset_s, voice, pitch_hz, gain) events into one mono buffer.
+
+    Events sharing a (voice, pitch) reuse one rendered buffer; all of them are
+    summed with a single scatter-add (np.bincount), so the Python work grows
+    with the number of distinct voices, not events. Tails past `duration` are
+    cut, or with loop=True wrap around to the start for a seamless loop.
+    """
+    if not events:
+        return np.zeros(int(rate * (duration or 0)))
+    onset, voice, pitch, gain = zip(*events)
+    onset = np.round(np.asarray(onset, dtype=np.float64) * rate).astype(np.int64)
+    gain = np.asarray(gain, dtype=np.float64)
+    groups = {}
+    for i, key in enumerate(zip(voice, pitch)):
+        groups.setdefault(key, []).append(i)
 
-def generate_complete_sound():
+    idx, val = [], []
+    for (v, p), members in groups.items():
+        buf = voice_buffer(v, p, rate)
+        members = np.asarray(members)
+        idx.append((onset[members, None] + np.arange(len(buf))).ravel())
+        val.append((gain[members, None] * buf).ravel())
+    idx, val = np.concatenate(idx), np.concatenate(val)
+
+    n = int(rate * duration) if duration is not None else int(idx.max()) + 1
+    if loop:
+        idx %= n
+    else:
+        keep = idx < n
+        idx, val = idx[keep], val[keep]
+    return np.bincount(idx, weights=val, minlength=n)
+
+def make_complete_sound(rate=SAMPLE_RATE):
     duration = 1.2
-    t_total = np.linspace(0, duration, int(SAMPLE_RATE * duration))
-    sound = np.zeros(len(t_total))
     notes = [523, 659, 784, 1047]
-    for i, freq in enumerate(notes):
-        delay = int(i * 0.08 * SAMPLE_RATE)
-        t_note = np.linspace(0, duration - i * 0.08, len(t_total) - delay)
-        note = np.sin(2 * np.pi * freq * t_note) * np.exp(-t_note * 4) * 0.5
-        note += np.sin(2 * np.pi * freq * 2 * t_note) * np.exp(-t_note * 6) * 0.15
-        sound[delay:delay + len(note)] += note
-    np.random.seed(42)
-    for _ in range(6):
-        pos = np.random.randint(0, int(SAMPLE_RATE * 0.6))
-        freq = np.random.choice([2093, 2349, 2637])
-        t_spark = np.linspace(0, 0.15, int(SAMPLE_RATE * 0.15))
-        spark = np.sin(2 * np.pi * freq * t_spark) * np.exp(-t_spark * 20) * 0.1
-        end = min(pos + len(spark), len(sound))
-        sound[pos:end] += spark[:end-pos]
-    sound = sound / np.max(np.abs(sound)) * 0.85
-    wavfile.write("assets/sounds/complete.wav", SAMPLE_RATE, (sound * 32767).astype(np.int16))
-    print("complete.wav")
-
-def generate_undo_sound():
+    events = [(i * 0.08, "chime", freq, 0.5) for i, freq in enumerate(notes)]
+    rng = np.random.RandomState(42)
+    events += [(rng.randint(0, int(rate * 0.6)) / rate, "sparkle", rng.choice([2093, 2349, 2637]), 0.1)
+               for _ in range(6)]
+    sound = sequence(events, rate, duration)
+    return sound / np.max(np.abs(sound)) * 0.85
+
+def make_undo_sound(rate=SAMPLE_RATE):
     duration = 0.25
-    t = np.linspace(0, duration, int(SAMPLE_RATE * duration))
+    t = np.linspace(0, duration, int(rate * duration))
     freq = 440 * np.exp(-t * 3)
     sound = np.sin(2 * np.pi * freq * t) * np.exp(-t * 12) * 0.6
-    sound = sound / np.max(np.abs(sound)) * 0.7
-    wavfile.write("assets/sounds/undo.wav", SAMPLE_RATE, (sound * 32767).astype(np.int16))
-    print("undo.wav")
-
-generate_stamp_sound()
-generate_complete_sound()
-generate_undo_sound()
-print("All sounds generated!")
+    return sound / np.max(np.abs(sound)) * 0.7
+
+SOUNDS = [
+    ("stamp", make_stamp_sound),
+    ("complete", make_complete_sound),
+    ("undo", make_undo_sound),
+]
+
+def to_pcm16(sound):
+    return (sound * 32767).astype(np.int16)
+
+def write_sounds(sink, rate=SAMPLE_RATE):
+    """Write one WAV file per sound."""
+    for name, make in SOUNDS:
+        data = render_cache.cached_bytes(
+            "sound", (name, rate), lambda: output_sink.encode_wav(rate, to_pcm16(make(rate))),
+            code=(make, to_pcm16, sequence, voice_buffer.__wrapped__)
+                 + tuple(fn for _, fn in VOICES.values()))
+        sink.write(f"{name}.wav", data)
+        print(f"{name}.wav")
+
+def write_sprite(sink, rate=SAMPLE_RATE, gap=SPRITE_GAP):
+    """Pack every sound into one WAV separated by silence, plus an offset manifest.
+
+    Offsets are given in milliseconds (for expo-av's setPositionAsync) and in
+    samples. The gap keeps decoder/resampler ringing of one clip from bleeding
+    into the start of the next.
+    """
+    pad = np.zeros(int(rate * gap))
+    chunks, manifest = [], {}
+    pos = 0
+    for i, (name, make) in enumerate(SOUNDS):
+        if i:
+            chunks.append(pad)
+            pos += len(pad)
+        clip = make(rate)
+        chunks.append(clip)
+        manifest[name] = {
+            "start": round(pos * 1000 / rate, 3),
+            "end": round((pos + len(clip)) * 1000 / rate, 3),
+            "startSample": pos,
+            "endSample": pos + len(clip),
+        }
+        pos += len(clip)
+    output_sink.save_wav(sink, "sprite.wav", rate, to_pcm16(np.concatenate(chunks)))
+    meta = {"file": "sprite.wav", "sampleRate": rate, "channels": 1, "sounds": manifest}
+    sink.write("sprite.json", json.dumps(meta, indent=2).encode())
+    print(f"sprite.wav ({pos} samples @ {rate} Hz) + sprite.json")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sprite", action="store_true",
+                        help="emit a single sprite.wav + sprite.json instead of separate files")
+    parser.add_argument("--rate", type=int, default=SAMPLE_RATE,
+                        help="output sample rate, e.g. 22050 to halve the bundle size")
+    parser.add_argument("--out", default=SOUNDS_DIR,
+                        help="output directory, or a .zip/.tar/.tar.gz archive to stream into")
+    args = parser.parse_args()
+
+    with output_sink.open_sink(args.out) as sink:
+        if args.sprite:
+            write_sprite(sink, args.rate)
+        else:
+            write_sounds(sink, args.rate)
+    print("All sounds generated!")
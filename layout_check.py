@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Layout-only dry run: measure every localized label against the box it has to
+fit, for every locale × theme × device, without rendering or encoding pixels.
+
+Strings come from the app itself (i18n/translations.ts, locales/*.json and the
+theme list in constants/themes.ts); boxes mirror generate_screenshots.py,
+generate_assets.py and the app's styles (e.g. draw_button's label box, the
+1284px-wide splash). Every label that overflows is auto-fitted with
+FontChain.fit (a cached binary search over measured widths); labels that
+do not fit even at the minimum size are reported as clipped.
+
+Usage: python3 layout_check.py [--locale de --locale hi] [--min-size 10] [--all]
+Exit status is 1 when anything is clipped.
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import time
+
+import generate_assets
+import generate_screenshots
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+TRANSLATIONS = os.path.join(ROOT, "i18n", "translations.ts")
+THEMES = os.path.join(ROOT, "constants", "themes.ts")
+LOCALES_DIR = os.path.join(ROOT, "locales")
+
+# Logical screen widths (pt); "screenshot" is the promo canvas of generate_screenshots
+DEVICES = {
+    "iphone-se": 375,
+    "iphone-15": 393,
+    "iphone-15-pro-max": 430,
+    "screenshot": generate_screenshots.W,
+}
+
+# Values substituted for {{placeholders}} before measuring
+SAMPLES = {"count": "12", "price": "¥480", "date": "2025/12/31", "emoji": "🎁", "name": "Reward"}
+
+MIN_SIZE = 10
+
+# Button label boxes come from draw_button itself, so the check and the render agree
+STAMP_LABEL_W = generate_screenshots.button_text_width(generate_screenshots.STAMP_BUTTON_W)
+REWARD_LABEL_W = generate_screenshots.button_text_width(generate_screenshots.REWARD_BUTTON_W)
+
+# (element, translation key, font size, available width for a screen `w` pt wide)
+SCREEN_ELEMENTS = [
+    ("card banner", "home.title", 14, lambda w: int(w * 0.85) - 40),
+    ("task name", "home.task", 20, lambda w: int(w * 0.85) - 24),
+    ("stamp button", "home.stampButton", 22, lambda w: STAMP_LABEL_W),
+    ("stamp button (done)", "home.achieved", 22, lambda w: STAMP_LABEL_W),
+    ("remaining banner", "home.remainingBanner", 16, lambda w: w - 32 - 2 * 24),
+    ("settings title", "settings.title", 22, lambda w: w - 48),
+    ("goal label", "settings.stampCount", 16, lambda w: w - 60),
+    ("undo button", "settings.undoStamp", 16, lambda w: w - 48 - 32),
+    ("close button", "settings.close", 16, lambda w: w - 48 - 32),
+    ("reward title", "reward.title", 64, lambda w: w - 40),
+    ("reward button", "reward.getReward", 22, lambda w: REWARD_LABEL_W),
+    ("theme card", "themes.{theme}", 11, lambda w: 80 - 2 * 4),
+]
+
+# (element, text source, font size, available width) on the 1284px store canvas
+STORE_WIDTH = 1284 - 2 * generate_assets.SAFE_MARGIN
+STORE_ELEMENTS = [
+    ("splash name", "name", 80, STORE_WIDTH),
+    ("caption", "captions", 64, STORE_WIDTH),
+    ("tagline", "tagline", 36, STORE_WIDTH),
+]
+
+
+# ── Sources ──
+
+_TS_TOKEN = re.compile(r'(?P<string>"(?:\\.|[^"\\])*")|(?P<key>[A-Za-z_$][\w$]*)(?=\s*:)'
+                       r'|(?P<trailing>,)(?=\s*[}\]])|(?P<comment>//[^\n]*)|(?P<other>.)', re.S)
+
+
+def load_translations(path=TRANSLATIONS):
+    """The `translations` object literal of translations.ts as a dict."""
+    with open(path, encoding="utf-8") as f:
+        src = f.read()
+    start = src.index("{", src.index("export const translations"))
+    out, depth = [], 0
+    for m in _TS_TOKEN.finditer(src, start):
+        kind, tok = m.lastgroup, m.group()
+        if kind == "key":
+            out.append(f'"{tok}"')
+        elif kind in ("string", "other"):
+            out.append(tok)
+            depth += tok == "{"
+            depth -= tok == "}"
+            if depth == 0:
+                break
+    return json.loads("".join(out))
+
+
+def load_themes(path=THEMES):
+    """{theme key: stamp icon} from constants/themes.ts."""
+    with open(path, encoding="utf-8") as f:
+        src = f.read()
+    return dict(re.findall(r'(\w+): \{[^}]*?stampIcon: "([^"]*)"', src))
+
+
+def load_app_names(folder=LOCALES_DIR):
+    names = {}
+    for path in sorted(glob.glob(os.path.join(folder, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            names[os.path.splitext(os.path.basename(path))[0]] = json.load(f).get("CFBundleDisplayName")
+    return names
+
+
+def lookup(table, key):
+    value = table
+    for part in key.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    if not isinstance(value, str):
+        return None
+    return re.sub(r"\{\{(\w+)\}\}", lambda m: SAMPLES.get(m.group(1), "00"), value)
+
+
+# ── Check ──
+
+def measure(chain, text, size, max_width, min_size):
+    """(status, width, fitted size): ok, overflow (fits at fitted size) or clipped."""
+    width = chain.width(text, size)
+    if width <= max_width:
+        return "ok", width, size
+    fitted = chain.fit(text, max_width, size, min_size)
+    if chain.width(text, fitted) <= max_width:
+        return "overflow", width, fitted
+    return "clipped", width, fitted
+
+
+def check(locales=None, min_size=MIN_SIZE):
+    """Measure the whole matrix; returns (results, counts) without rendering anything."""
+    translations = load_translations()
+    themes = load_themes()
+    app_names = load_app_names()
+    locales = locales or list(translations)
+    screen = generate_screenshots.fonts()
+    store = generate_assets.fonts()
+    results, counts = [], {"ok": 0, "overflow": 0, "clipped": 0}
+
+    def record(status, *row):
+        counts[status] += 1
+        if status != "ok":
+            results.append((status,) + row)
+
+    for locale in locales:
+        table = translations.get(locale, {})
+        for theme, icon in themes.items():
+            for device, w in DEVICES.items():
+                for element, key, size, avail in SCREEN_ELEMENTS:
+                    text = lookup(table, key.format(theme=theme))
+                    if text is None:
+                        continue
+                    status, width, fitted = measure(screen, text, size, avail(w), min_size)
+                    record(status, locale, theme, device, element, text, size, width, avail(w), fitted)
+                # Header: theme stamp icon + count
+                status, width, fitted = measure(screen, f"{icon} 12", 20, 80, min_size)
+                record(status, locale, theme, device, "header count", f"{icon} 12", 20, width, 80, fitted)
+
+        # Store assets are device and theme independent
+        cfg = generate_assets.localized(generate_assets.APP, locale)
+        texts = {"name": app_names.get(locale) or cfg["name"], "captions": cfg["captions"][:4],
+                 "tagline": cfg.get("tagline")}
+        for element, source, size, avail in STORE_ELEMENTS:
+            values = texts[source] if isinstance(texts[source], list) else [texts[source]]
+            for text in filter(None, values):
+                status, width, fitted = measure(store, text, size, avail, min_size)
+                record(status, locale, "-", "store", element, text, size, width, avail, fitted)
+    return results, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Layout dry run across locales, themes and devices")
+    parser.add_argument("--locale", action="append", help="check only these locales")
+    parser.add_argument("--min-size", type=int, default=MIN_SIZE,
+                        help="smallest font size auto-fit may shrink to before reporting a clip")
+    parser.add_argument("--all", action="store_true",
+                        help="list every theme/device hit instead of one line per locale/element")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    results, counts = check(args.locale, args.min_size)
+    elapsed = time.perf_counter() - t0
+
+    seen = set()
+    for status, locale, theme, device, element, text, size, width, avail, fitted in results:
+        key = (status, locale, element, text, avail)
+        if not args.all and key in seen:
+            continue
+        seen.add(key)
+        where = f"{locale}/{theme}/{device}" if args.all else f"{locale}/{device}"
+        fix = f"fits at {fitted}px" if status == "overflow" else f"still too wide at {fitted}px"
+        print(f"  {status.upper():8s} {where:24s} {element:20s} {width:6.0f} > {avail}px "
+              f"@{size}px, {fix}: {text!r}")
+
+    total = sum(counts.values())
+    print(f"{total} labels checked in {elapsed * 1000:.0f} ms: {counts['ok']} ok, "
+          f"{counts['overflow']} auto-fitted, {counts['clipped']} clipped")
+    raise SystemExit(1 if counts["clipped"] else 0)
+
+
+if __name__ == "__main__":
+    main()
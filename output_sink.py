@@ -0,0 +1,157 @@
+"""
+Pluggable output sinks for the asset generators.
+
+Generators encode each asset to bytes in memory and hand them to a sink
+instead of calling img.save()/wavfile.write() on computed paths:
+
+    DirSink      files under a directory, written to a temp file then renamed
+                 into place so readers never see a partial asset
+    MemorySink   a dict of relative path -> bytes, for callers that upload or
+                 post-process without touching disk
+    ZipSink      streams entries into a .zip archive
+    TarSink      streams entries into a .tar / .tar.gz / .tgz archive
+
+open_sink(target) picks one from a path ("out.zip", "out.tar.gz", "some/dir")
+or returns a MemorySink for None. All sinks are context managers.
+"""
+
+import io
+import os
+import tarfile
+import tempfile
+import time
+import zipfile
+
+import numpy as np
+from scipy.io import wavfile
+
+# Already-compressed formats are stored as-is inside zip archives
+_STORED_EXTS = (".png", ".gif", ".webp", ".jpg", ".jpeg")
+
+
+def _read_umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# mkstemp creates files 0600; renamed assets get the usual umask default instead
+_FILE_MODE = 0o666 & ~_read_umask()
+
+
+class DirSink:
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, name):
+        return os.path.join(self.root, name)
+
+    def write(self, name, data):
+        dest = self.path(name)
+        folder = os.path.dirname(dest) or "."
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=folder, prefix=".tmp-", suffix=os.path.basename(dest))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.chmod(tmp, _FILE_MODE)
+            os.replace(tmp, dest)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return dest
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MemorySink(DirSink):
+    def __init__(self):
+        self.files = {}
+
+    def path(self, name):
+        return name
+
+    def write(self, name, data):
+        self.files[name] = bytes(data)
+        return name
+
+
+class ZipSink(DirSink):
+    def __init__(self, target):
+        self.target = target
+        self.zf = zipfile.ZipFile(target, "w")
+
+    def path(self, name):
+        return f"{self.target}:{name}"
+
+    def write(self, name, data):
+        stored = name.lower().endswith(_STORED_EXTS)
+        info = zipfile.ZipInfo(name, time.localtime()[:6])
+        info.compress_type = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+        info.external_attr = 0o644 << 16  # a bare ZipInfo extracts as 0600
+        self.zf.writestr(info, data)
+        return self.path(name)
+
+    def close(self):
+        self.zf.close()
+
+
+class TarSink(ZipSink):
+    def __init__(self, target):
+        self.target = target
+        gz = target.endswith((".tar.gz", ".tgz"))
+        # Stream mode: entries are appended sequentially, nothing is seeked back
+        self.tf = tarfile.open(target, "w|gz" if gz else "w|")
+
+    def write(self, name, data):
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        self.tf.addfile(info, io.BytesIO(data))
+        return self.path(name)
+
+    def close(self):
+        self.tf.close()
+
+
+def open_sink(target):
+    if target is None:
+        return MemorySink()
+    if target.endswith(".zip"):
+        return ZipSink(target)
+    if target.endswith((".tar", ".tar.gz", ".tgz")):
+        return TarSink(target)
+    return DirSink(target)
+
+
+def is_archive(target):
+    return target is not None and target.endswith((".zip", ".tar", ".tar.gz", ".tgz"))
+
+
+# ── Encoders ──
+
+def encode_image(img, format="PNG", **params):
+    buf = io.BytesIO()
+    img.save(buf, format, **params)
+    return buf.getvalue()
+
+
+def encode_wav(rate, data):
+    buf = io.BytesIO()
+    wavfile.write(buf, rate, np.asarray(data))
+    return buf.getvalue()
+
+
+def save_image(sink, name, img, format="PNG", **params):
+    return sink.write(name, encode_image(img, format, **params))
+
+
+def save_wav(sink, name, rate, data):
+    return sink.write(name, encode_wav(rate, data))
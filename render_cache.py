@@ -0,0 +1,269 @@
+"""
+Opt-in on-disk render cache shared across checkouts and projects.
+
+Set RENDER_CACHE_DIR (e.g. ~/.cache/zerocode-render) to enable it; without it
+every helper here simply computes. Entries are keyed by a SHA-256 of the
+render inputs, including the source of the function that produces them, so
+editing a generator invalidates its entries automatically.
+
+The cache holds encoded outputs (WAV/PNG bytes) and intermediate layers (raw
+image buffers). Total size is capped by RENDER_CACHE_MAX_MB (default 512),
+evicting least-recently-used entries first; a hit refreshes the entry's mtime.
+Writes go to a temp file and are renamed into place. Renames, the shared size
+counter (<dir>/.size, so the cap holds across every process writing to the
+directory), eviction and the lifetime hit/miss counters are serialized with an
+flock on <dir>/.lock, so concurrent workers on the same host are safe.
+
+    python3 render_cache.py          # show size and lifetime hit/miss stats
+    python3 render_cache.py --clear  # drop every entry
+"""
+
+import atexit
+import hashlib
+import inspect
+import json
+import os
+import struct
+import tempfile
+import threading
+from contextlib import contextmanager
+
+from PIL import Image
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to best-effort without locking
+    fcntl = None
+
+CACHE_DIR = os.environ.get("RENDER_CACHE_DIR")
+MAX_BYTES = int(float(os.environ.get("RENDER_CACHE_MAX_MB", "512")) * 1024 * 1024)
+VERSION = 1
+
+stats = {"hits": 0, "misses": 0, "evictions": 0}
+_flushed = dict.fromkeys(stats, 0)  # counts already added to stats.json
+_stats_lock = threading.Lock()  # render threads share this process's counters
+
+
+def enabled():
+    return bool(CACHE_DIR)
+
+
+def _source(fn):
+    try:
+        return inspect.getsource(fn)
+    except (OSError, TypeError):  # e.g. defined in exec'd code
+        return fn.__code__.co_code.hex()
+
+
+def make_key(namespace, inputs, code=None):
+    """Content hash of the inputs.
+
+    `code` is a function (or tuple of functions) whose source text joins the
+    hash, so changing how something is drawn invalidates what it drew.
+    """
+    h = hashlib.sha256()
+    h.update(f"{VERSION}:{namespace}:".encode())
+    h.update(json.dumps(inputs, sort_keys=True, default=repr).encode())
+    for fn in code if isinstance(code, tuple) else (code,) if code else ():
+        h.update(_source(fn).encode())
+    return h.hexdigest()
+
+
+def _path(key):
+    return os.path.join(CACHE_DIR, key[:2], key)
+
+
+@contextmanager
+def _locked():
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(os.path.join(CACHE_DIR, ".lock"), "a+") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _entries():
+    for sub in os.scandir(CACHE_DIR):
+        if sub.is_dir() and len(sub.name) == 2:
+            for entry in os.scandir(sub.path):
+                if not entry.name.startswith(".tmp-"):
+                    yield entry
+
+
+def _stat_entries():
+    """(mtime, size, path) of every entry, skipping ones evicted meanwhile."""
+    items = []
+    for entry in _entries():
+        try:
+            st = entry.stat()
+        except FileNotFoundError:
+            continue
+        items.append((st.st_mtime, st.st_size, entry.path))
+    return items
+
+
+def _count(name, n=1):
+    with _stats_lock:
+        stats[name] += n
+
+
+def _read_size():
+    """Total bytes of all entries; call under _locked(). Rescans if the counter is gone."""
+    try:
+        with open(os.path.join(CACHE_DIR, ".size")) as f:
+            return int(f.read())
+    except (FileNotFoundError, ValueError):
+        return sum(size for _, size, _ in _stat_entries())
+
+
+def _write_size(total):
+    with open(os.path.join(CACHE_DIR, ".size"), "w") as f:
+        f.write(str(total))
+
+
+def get(key):
+    if not enabled():
+        return None
+    path = _path(key)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        os.utime(path)  # mark as recently used
+    except FileNotFoundError:  # absent, or evicted by another worker
+        _count("misses")
+        return None
+    _count("hits")
+    return data
+
+
+def put(key, data):
+    if not enabled():
+        return
+    path = _path(key)
+    folder = os.path.dirname(path)
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=".tmp-")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    with _locked():
+        total = _read_size()
+        try:
+            total -= os.stat(path).st_size  # replacing an entry another worker wrote
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, path)
+        total += len(data)
+        _write_size(total)
+    if total > MAX_BYTES:
+        evict()
+
+
+def evict(max_bytes=None):
+    """Delete least-recently-used entries until the cache fits `max_bytes`."""
+    limit = MAX_BYTES if max_bytes is None else max_bytes
+    with _locked():
+        items = _stat_entries()
+        total = sum(size for _, size, _ in items)
+        for _, size, path in sorted(items):
+            if total <= limit:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                continue
+            total -= size
+            _count("evictions")
+        _write_size(total)
+
+
+def cached_bytes(namespace, inputs, compute, code=None):
+    """Return compute() for `inputs`, served from the cache when possible."""
+    if not enabled():
+        return compute()
+    key = make_key(namespace, inputs, code)
+    data = get(key)
+    if data is None:
+        data = compute()
+        put(key, data)
+    return data
+
+
+def _pack_image(img):
+    mode = img.mode.encode()
+    return struct.pack("<B", len(mode)) + mode + struct.pack("<II", *img.size) + img.tobytes()
+
+
+def _unpack_image(data):
+    n = data[0]
+    mode = data[1:1 + n].decode()
+    w, h = struct.unpack_from("<II", data, 1 + n)
+    return Image.frombytes(mode, (w, h), data[9 + n:])
+
+
+def cached_image(namespace, inputs, render, code=None):
+    """Return render() for `inputs`; layers are stored raw so a hit is a memcpy."""
+    if not enabled():
+        return render()
+    return _unpack_image(cached_bytes(namespace, inputs, lambda: _pack_image(render()),
+                                      code or render))
+
+
+def flush_stats():
+    """Add this process's counters since the last flush to <dir>/stats.json.
+
+    Runs at exit, which pool workers never reach; they call it after each job.
+    """
+    with _stats_lock:
+        delta = {k: v - _flushed[k] for k, v in stats.items()}
+        _flushed.update(stats)
+    if not enabled() or not any(delta.values()):
+        return
+    with _locked():
+        path = os.path.join(CACHE_DIR, "stats.json")
+        try:
+            with open(path) as f:
+                total = json.load(f)
+        except (FileNotFoundError, ValueError):
+            total = {}
+        for k, v in delta.items():
+            total[k] = total.get(k, 0) + v
+        with open(path, "w") as f:
+            json.dump(total, f)
+
+
+def _record_stats():
+    flush_stats()
+    if not enabled() or not (stats["hits"] or stats["misses"]):
+        return
+    lookups = stats["hits"] + stats["misses"]
+    print(f"render cache: {stats['hits']}/{lookups} hits, {stats['evictions']} evictions "
+          f"({CACHE_DIR})")
+
+
+atexit.register(_record_stats)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Shared render cache maintenance")
+    parser.add_argument("--clear", action="store_true", help="delete every cache entry")
+    args = parser.parse_args()
+    if not enabled():
+        raise SystemExit("RENDER_CACHE_DIR is not set; the render cache is disabled")
+    if args.clear:
+        evict(0)
+    sizes = [size for _, size, _ in _stat_entries()] if os.path.isdir(CACHE_DIR) else []
+    try:
+        with open(os.path.join(CACHE_DIR, "stats.json")) as f:
+            total = json.load(f)
+    except (FileNotFoundError, ValueError):
+        total = {}
+    lookups = total.get("hits", 0) + total.get("misses", 0)
+    print(f"{CACHE_DIR}: {len(sizes)} entries, {sum(sizes) / 1048576:.1f} MB "
+          f"of {MAX_BYTES / 1048576:.0f} MB")
+    print(f"lifetime: {total.get('hits', 0)}/{lookups} hits, {total.get('evictions', 0)} evictions")
@@ -0,0 +1,106 @@
+"""
+Per-job render state for running the generators headless and concurrently.
+
+A RenderContext carries what renders used to take from module globals: the
+canvas and a font registry. ImageFont and FontChain instances belong to one
+context, so a FreeType face is never used by two threads at once. Helpers
+that look fonts up through current() get the context entered on their own
+thread (a ContextVar, so every thread starts without one):
+
+    with RenderContext((1024, 1024)) as ctx:
+        render_icon(ctx)
+    pixels = ctx.export()  # read-only (H, W, bands) uint8 array
+    png = ctx.png()        # memoryview of the encoded file
+
+Outside any `with` block current() is a process-wide default context; the
+command-line scripts use that one. Enter a context per thread (or per job)
+when rendering concurrently.
+
+Nothing else needs to live here: every render seeds its own local RNG, and
+the module-level lru_caches (gradients, shadow masks, voice buffers) memoize
+pure functions whose results are never modified in place.
+"""
+
+import contextvars
+import io
+import threading
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+import font_coverage
+
+_current = contextvars.ContextVar("render_context", default=None)
+_default = None
+_default_lock = threading.Lock()
+
+
+class RenderContext:
+    def __init__(self, size=(1, 1), mode="RGBA", background=(0, 0, 0, 0)):
+        self.canvas = Image.new(mode, size, background)
+        self._fonts = {}
+        self._chains = {}
+        self._lock = threading.Lock()
+        self._tokens = []
+
+    def __enter__(self):
+        self._tokens.append(_current.set(self))
+        return self
+
+    def __exit__(self, *exc):
+        _current.reset(self._tokens.pop())
+
+    @property
+    def draw(self):
+        """ImageDraw on the current canvas; fetch it again after replacing the canvas."""
+        return ImageDraw.Draw(self.canvas)
+
+    # ── Font registry ──
+
+    def font(self, path, size, index=0):
+        """ImageFont for (path, size, index), loaded once per context."""
+        key = (path, size, index)
+        with self._lock:
+            f = self._fonts.get(key)
+            if f is None:
+                f = self._fonts[key] = ImageFont.truetype(path, size, index=index)
+            return f
+
+    def chain(self, name="sans", primary=None):
+        """This context's FontChain ('sans' or 'bold', optionally led by `primary`)."""
+        key = (name, primary)
+        with self._lock:
+            c = self._chains.get(key)
+            if c is None:
+                c = self._chains[key] = font_coverage.make_chain(name, primary)
+            return c
+
+    # ── Output ──
+
+    def export(self):
+        """The canvas pixels as a read-only uint8 array (H, W, bands).
+
+        The canvas is exported once; the array (and its `.data` memoryview)
+        is a view over that export, so passing it on copies nothing further.
+        """
+        w, h = self.canvas.size
+        data = self.canvas.tobytes()
+        return np.frombuffer(data, dtype=np.uint8).reshape(h, w, len(self.canvas.getbands()))
+
+    def png(self, **params):
+        """The canvas encoded as PNG: a memoryview over the encoder's buffer."""
+        buf = io.BytesIO()
+        self.canvas.save(buf, "PNG", **params)
+        return buf.getbuffer()
+
+
+def current():
+    """The RenderContext entered on this thread, else the process-wide default."""
+    ctx = _current.get()
+    if ctx is not None:
+        return ctx
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = RenderContext()
+        return _default
@@ -0,0 +1,184 @@
+"""
+Batched signed-distance-field rasterizer for anti-aliased circles and rounded
+rectangles.
+
+draw_shapes() takes per-shape arrays (center, half size, corner radius, fill,
+stroke, stroke width, dash pattern) and evaluates every shape's SDF over its
+own bounding box in one vectorized pass, with analytic one-pixel
+anti-aliasing. A circle is a rounded rect whose corner radius equals its half
+size. Strokes sit inside the edge like PIL's outline=; dashes are laid out by
+arc length around the shape, so a dashed ring is one shape, not 24 lines.
+
+The image is updated in place (only the union of the shapes' boxes is read
+and written back), so existing ImageDraw handles on it stay valid.
+
+    sdf.draw_shapes(img, cx, cy, r, fill="#F0F9FF", stroke="#B8E4F9",
+                    stroke_width=2, dash=(r * 0.14, r * 0.26))
+"""
+
+import math
+
+import numpy as np
+from PIL import Image
+
+# Shapes rasterized per batch; bounds the (batch, Sy, Sx) working arrays
+BATCH = 1024
+
+
+def hex_to_rgb(h):
+    h = h.lstrip("#")
+    return tuple(int(h[i:i+2], 16) for i in (0, 2, 4))
+
+
+def rgba_array(colors, n):
+    """(n, 4) float array from None, a color, or a list of colors (hex or tuples)."""
+    if colors is None:
+        return np.zeros((n, 4))
+    if isinstance(colors, np.ndarray) and colors.ndim == 2:
+        return colors.astype(np.float64)
+    if isinstance(colors, str) or isinstance(colors[0], (int, float, np.number)):
+        colors = [colors]
+    rows = []
+    for c in colors:
+        if c is None:
+            rows.append((0, 0, 0, 0))
+            continue
+        c = hex_to_rgb(c) if isinstance(c, str) else tuple(c)
+        rows.append(c + (255,) * (4 - len(c)))
+    arr = np.array(rows, dtype=np.float64)
+    return np.repeat(arr, n, axis=0) if len(arr) == 1 else arr
+
+
+def composite(img, flat, rgb, alpha, box=None):
+    """Blend entries over `img` in place, in painter's order.
+
+    flat   pixel index into the box (row-major), in painter's order
+    rgb    (M, 3) straight color per entry
+    alpha  (M,) coverage * opacity in [0, 1]
+    box    (x0, y0, x1, y1) region the indices refer to (default: whole image)
+
+    Entries are grouped into layers by how many earlier entries hit the same
+    pixel; each layer has at most one entry per pixel and is blended in one
+    vectorized pass, so overlapping anti-aliased edges all contribute and the
+    pass count is the deepest overlap, not the entry count.
+    """
+    if len(flat) == 0:
+        return img
+    box = box or (0, 0) + img.size
+    mode = img.mode
+    region = img.crop(box) if box != (0, 0) + img.size else img
+    canvas = np.array(region.convert("RGBA"), dtype=np.float32)
+
+    # Depth of each entry among those covering its pixel (0 = drawn first)
+    order = np.argsort(flat, kind="stable")
+    pix = flat[order]
+    n = np.arange(len(pix))
+    starts = np.maximum.accumulate(np.where(np.r_[True, pix[1:] != pix[:-1]], n, 0))
+    depth = np.empty(len(flat), dtype=np.int64)
+    depth[order] = n - starts
+    by_depth = np.argsort(depth, kind="stable")
+    bounds = np.cumsum(np.bincount(depth))
+
+    out = canvas.reshape(-1, 4)
+    lo = 0
+    for hi in bounds:
+        layer = by_depth[lo:hi]
+        lo = hi
+        at, a_src = flat[layer], alpha[layer]
+        dst = out[at]
+        a_dst = dst[:, 3] / 255.0 * (1 - a_src)
+        a_out = a_src + a_dst
+        out[at, :3] = ((rgb[layer] * a_src[:, None] + dst[:, :3] * a_dst[:, None])
+                       / np.maximum(a_out, 1e-6)[:, None])
+        out[at, 3] = a_out * 255
+    result = Image.fromarray(np.clip(canvas + 0.5, 0, 255).astype(np.uint8), "RGBA")
+    if mode != "RGBA":
+        result = result.convert(mode)
+    img.paste(result, box[:2])
+    return img
+
+
+def rounded_box_sdf(dx, dy, hw, hh, corner):
+    """Signed distance from offsets (dx, dy) to a centered rounded rect; negative inside."""
+    qx = np.abs(dx) - (hw - corner)
+    qy = np.abs(dy) - (hh - corner)
+    outside = np.hypot(np.maximum(qx, 0), np.maximum(qy, 0))
+    return outside + np.minimum(np.maximum(qx, qy), 0) - corner
+
+
+def draw_shapes(img, cx, cy, hw, hh=None, corner=None, fill=None, stroke=None,
+                stroke_width=0.0, dash=None, dash_phase=0.0, batch=BATCH):
+    """Rasterize a batch of circles / rounded rects onto `img` in place.
+
+    cx, cy        centers (scalars or arrays; everything broadcasts)
+    hw, hh        half width / half height (hh defaults to hw)
+    corner        corner radius (defaults to min(hw, hh): circles and pills)
+    fill, stroke  a color, a list of colors, or None
+    stroke_width  inner stroke width in px, 0 for none
+    dash          (on, off) lengths in px along the outline, None for solid
+    """
+    cx = np.atleast_1d(np.asarray(cx, dtype=np.float64))
+    n = len(cx)
+
+    def full(v):
+        return np.broadcast_to(np.asarray(v, dtype=np.float64), (n,)).copy()
+
+    cy, hw = full(cy), full(hw)
+    hh = hw.copy() if hh is None else full(hh)
+    corner = np.minimum(hw, hh) if corner is None else np.minimum(full(corner), np.minimum(hw, hh))
+    fill_c, stroke_c = rgba_array(fill, n), rgba_array(stroke, n)
+    sw = full(stroke_width)
+    dash_on = np.full(n, np.inf) if dash is None else full(dash[0])
+    dash_off = np.zeros(n) if dash is None else full(dash[1])
+    phase = full(dash_phase)
+
+    # One region covering every shape; indices below are relative to it
+    W, H = img.size
+    x0 = max(0, int(math.floor((cx - hw).min())) - 1)
+    y0 = max(0, int(math.floor((cy - hh).min())) - 1)
+    x1 = min(W, int(math.ceil((cx + hw).max())) + 2)
+    y1 = min(H, int(math.ceil((cy + hh).max())) + 2)
+    if x1 <= x0 or y1 <= y0:
+        return img
+    rw = x1 - x0
+
+    flats, rgbs, alphas = [], [], []
+    for lo in range(0, n, batch):
+        s = slice(lo, min(lo + batch, n))
+        sx = int(math.ceil(2 * hw[s].max())) + 3
+        sy = int(math.ceil(2 * hh[s].max())) + 3
+        ox = np.floor(cx[s] - hw[s]).astype(np.int64) - 1
+        oy = np.floor(cy[s] - hh[s]).astype(np.int64) - 1
+        px = ox[:, None, None] + np.arange(sx)[None, None, :]
+        py = oy[:, None, None] + np.arange(sy)[None, :, None]
+        dx = px + 0.5 - cx[s, None, None]
+        dy = py + 0.5 - cy[s, None, None]
+
+        d = rounded_box_sdf(dx, dy, hw[s, None, None], hh[s, None, None], corner[s, None, None])
+        inside = np.clip(0.5 - d, 0.0, 1.0)
+        ring = inside - np.clip(0.5 - (d + sw[s, None, None]), 0.0, 1.0)
+
+        # Dashes by arc length along the outline (angle times mean radius)
+        on, off = dash_on[s, None, None], dash_off[s, None, None]
+        period = on + off
+        dashed = np.isfinite(on) & (off > 0)
+        if dashed.any():
+            radius = (hw[s] + hh[s])[:, None, None] / 2
+            arc = (np.arctan2(dy, dx) % (2 * math.pi)) * radius + phase[s, None, None]
+            m = np.mod(arc, np.where(dashed, period, 1.0))
+            into = np.where(m < on, np.minimum(m, on - m), -np.minimum(m - on, period - m))
+            ring = np.where(dashed, ring * np.clip(0.5 + into, 0.0, 1.0), ring)
+
+        # Stroke over fill, premixed per pixel
+        a_f = inside * (fill_c[s, 3] / 255.0)[:, None, None]
+        a_s = ring * (stroke_c[s, 3] / 255.0)[:, None, None]
+        a = a_s + a_f * (1 - a_s)
+        keep = (a > 0) & (px >= x0) & (px < x1) & (py >= y0) & (py < y1)
+        w_s = np.where(a > 0, a_s / np.maximum(a, 1e-9), 0.0)[keep][:, None]
+        idx = np.broadcast_to(np.arange(s.start, s.stop)[:, None, None], keep.shape)[keep]
+        rgbs.append(stroke_c[idx, :3] * w_s + fill_c[idx, :3] * (1 - w_s))
+        alphas.append(a[keep])
+        flats.append(((py - y0) * rw + (px - x0))[keep])
+
+    return composite(img, np.concatenate(flats), np.concatenate(rgbs),
+                     np.concatenate(alphas), (x0, y0, x1, y1))
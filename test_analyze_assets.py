@@ -0,0 +1,19 @@
+import os
+
+import analyze_assets
+
+
+def _row(name, size, sha1, variant_bytes=None):
+    variants = [] if variant_bytes is None else [
+        {"tag": "webp", "ext": ".webp", "bytes": variant_bytes, "decode_ms": 1.0}]
+    return {"path": os.path.join(analyze_assets.ROOT, name), "bytes": size, "budget": 100 * 1024,
+            "sha1": sha1, "decode_ms": 1.0, "variants": variants}
+
+
+def test_duplicate_groups_count_their_saving_once(capsys):
+    rows = [_row("a.png", 4096, "x", 1024), _row("b.png", 4096, "x", 1024),
+            _row("c.png", 4096, "x", 1024), _row("d.png", 2048, "y", 1024)]
+    analyze_assets.print_report(rows)
+    summary = capsys.readouterr().out.strip().splitlines()[-1]
+    assert "4.0 KB saveable" in summary  # 3 KB for the a/b/c group + 1 KB for d
+    assert "8.0 KB in duplicates" in summary
@@ -0,0 +1,17 @@
+import os
+
+import batch_assets
+
+
+def fake_job(app, out_root):
+    if app["slug"] == "crash":
+        os._exit(1)  # as if the worker segfaulted or was OOM-killed
+    return app["slug"], 1, 0.0, None
+
+
+def test_crashed_worker_fails_only_its_own_job(monkeypatch, tmp_path):
+    monkeypatch.setattr(batch_assets, "run_job", fake_job)
+    apps = [{"slug": s} for s in ("a", "b", "crash", "c", "d")]
+    results, _ = batch_assets.run_batch(apps, str(tmp_path), workers=2)
+    assert [r[0] for r in results] == ["a", "b", "crash", "c", "d"]
+    assert [r[0] for r in results if r[3]] == ["crash"]
@@ -0,0 +1,77 @@
+import numpy as np
+from PIL import Image, ImageDraw
+
+import display_list
+from display_list import DisplayList
+
+
+def _record(draw):
+    """Draw the same scene on an ImageDraw or a DisplayList."""
+    for y in range(0, 40):  # banded gradient, one rectangle per row
+        draw.rectangle([0, y, 59, y], fill=(200 + y // 10 * 10, 100, 50, 255))
+    draw.ellipse([10, 5, 30, 25], fill=(0, 120, 255, 255), outline=(0, 0, 0, 255), width=2)
+    draw.polygon([(2, 30), (40, 10), (50, 38)], fill=(0, 200, 0, 180))
+    draw.line([(-10, -10), (70, 50)], fill=(255, 255, 255, 255), width=3)
+    draw.rounded_rectangle([200, 200, 260, 230], radius=8, fill=(255, 0, 0, 255))  # off canvas
+
+
+def test_replay_at_1x_matches_direct_drawing():
+    direct = Image.new("RGBA", (60, 40), (0, 0, 0, 0))
+    _record(ImageDraw.Draw(direct))
+    dl = DisplayList((60, 40))
+    _record(dl)
+    replayed = dl.replay()
+    assert np.array_equal(np.asarray(replayed), np.asarray(direct))
+    assert dl.stats["culled"] == 1
+    assert dl.stats["clipped"] == 1  # the line
+    assert dl.stats["merged"] == 36  # 40 rows, 4 distinct colors
+
+
+def test_replay_scales_the_canvas_and_geometry():
+    dl = DisplayList((60, 40))
+    dl.rectangle([10, 10, 19, 19], fill=(255, 0, 0, 255))
+    img = dl.replay(2)
+    alpha = np.asarray(img)[..., 3]
+    assert img.size == (120, 80)
+    assert alpha.sum() == 20 * 20 * 255
+
+
+def test_raster_ops_get_the_scale_and_draft_stand_ins():
+    calls = []
+
+    def paint(img, s, tag):
+        calls.append(("full", s, tag))
+
+    def cheap(img, s, tag):
+        calls.append(("draft", s, tag))
+
+    dl = DisplayList((60, 40))
+    dl.raster(paint, "a", bounds=(0, 0, 10, 10), draft=cheap)
+    dl.raster(paint, "b", bounds=(100, 100, 110, 110))  # culled
+    dl.raster(paint, "c", draft=display_list.skip)
+    dl.replay(2)
+    dl.replay(0.5, draft=True)
+    assert calls == [("full", 2, "a"), ("full", 2, "c"), ("draft", 0.5, "a")]
+
+
+def test_layers_composite_like_a_full_canvas_overlay():
+    def scene(draw):
+        draw.ellipse([12, 8, 30, 26], fill=(0, 0, 255, 120))
+        draw.polygon([(20, 20), (44, 14), (36, 34)], fill=(255, 0, 0, 90))
+        draw.line([(14, 30), (50, 30)], fill=(0, 0, 0, 200), width=2)
+
+    base = Image.new("RGBA", (60, 40), (250, 240, 200, 255))
+    overlay = Image.new("RGBA", base.size, (0, 0, 0, 0))
+    scene(ImageDraw.Draw(overlay))
+    expected = Image.alpha_composite(base, overlay)
+
+    dl = DisplayList((60, 40))
+    dl.rectangle([0, 0, 59, 39], fill=(250, 240, 200, 255))
+    scene(dl.layer())
+    assert np.array_equal(np.asarray(dl.replay()), np.asarray(expected))
+    # at 2x the cropped overlay matches replaying the layer's ops on their own
+    alone = DisplayList((60, 40))
+    scene(alone)
+    expected2 = Image.alpha_composite(Image.new("RGBA", (120, 80), (250, 240, 200, 255)),
+                                      alone.replay(2))
+    assert np.array_equal(np.asarray(dl.replay(2)), np.asarray(expected2))
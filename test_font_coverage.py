@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageFont
+
+import font_coverage
+
+
+@pytest.fixture
+def sans():
+    try:
+        return font_coverage.make_chain("sans")
+    except OSError:
+        pytest.skip("no sans font installed")
+
+
+def test_runs_keep_marks_with_their_base(sans):
+    text = "a\u0301b \u2b50\ufe0f"
+    runs = sans.runs(text)
+    assert "".join(run for _, run in runs) == text
+    assert not any(run[0] in "\u0301\ufe0f" for _, run in runs)
+
+
+def test_fit_is_the_largest_size_that_fits(sans):
+    size = sans.fit("Stempel holen!", 120, 40)
+    assert sans.width("Stempel holen!", size) <= 120 < sans.width("Stempel holen!", size + 1)
+
+
+def test_scaled_strike_is_clipped_not_shifted(sans):
+    # Stand in for a fixed-strike bitmap font: glyphs rendered at 2x and scaled down
+    path, index, _ = sans.faces[0]
+    sans.font = lambda face, size: (ImageFont.truetype(path, 2 * size, index=index), 0.5)
+    text = "MW"
+    clipped = Image.new("RGBA", (60, 40), (255, 255, 255, 255))
+    sans.draw(clipped, (-7, -9), text, 24, fill=(0, 0, 0, 255))
+    whole = Image.new("RGBA", (100, 80), (255, 255, 255, 255))
+    sans.draw(whole, (13, 11), text, 24, fill=(0, 0, 0, 255))
+    assert np.array_equal(np.asarray(clipped), np.asarray(whole.crop((20, 20, 80, 60))))
+
+
+def test_empty_chain_is_an_error():
+    with pytest.raises(OSError, match="could be loaded"):
+        font_coverage.FontChain([("/nonexistent/font.ttf", 0)])
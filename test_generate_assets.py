@@ -0,0 +1,24 @@
+import io
+import json
+
+from PIL import Image
+
+import generate_assets
+import output_sink
+
+
+def test_minimal_splash_is_the_one_image_app_json_loads(tmp_path):
+    app = {**generate_assets.APP, "locales": {}}
+    sink = output_sink.MemorySink()
+    generate_assets.generate(app, sink, splash="minimal")
+    splashes = sorted(name for name in sink.files if name.startswith("splash"))
+    assert splashes == ["splash.png"]
+    strip = Image.open(io.BytesIO(sink.files["splash.png"]))
+    assert strip.width == 1284  # @3x, as wide as the full splash
+
+    path = tmp_path / "app.json"
+    path.write_text(json.dumps({"expo": {"name": "x"}}))
+    generate_assets.write_splash_config(app, str(path))
+    splash = json.loads(path.read_text())["expo"]["splash"]
+    assert splash["image"] == "./assets/splash.png"
+    assert splash["resizeMode"] == "contain"
@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+import generate_previews
+
+
+@pytest.mark.parametrize("name", list(generate_previews.SCENES))
+def test_dirty_rect_frames_match_full_renders(name):
+    fps = 15
+    frames, ratio = generate_previews.render_clip(name, fps=fps, seconds=2.0, workers=0)
+    scene = generate_previews._scene
+    assert 0 < ratio < 1
+    for i, frame in enumerate(frames):
+        full = scene.draw(scene.background.copy(), (0, 0), i / fps).convert("RGB")
+        assert np.array_equal(np.asarray(frame), np.asarray(full)), f"frame {i}"
+
+
+def test_preview_stamp_lands_on_the_card_slot():
+    dl = generate_previews.shots.record_screenshot_02(filled=6, burst=False)
+    painted = [state["args"][:2] for kind, _, state in dl.ops
+               if kind == "raster" and state["fn"] is generate_previews.shots._paint_stamp_slots]
+    slots, cell = generate_previews.shots.main_card_slots(12)
+    assert painted == [(slots, cell)]
@@ -0,0 +1,65 @@
+import io
+import json
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+import generate_sounds
+import output_sink
+
+RATE = 8000
+
+
+def _naive(events, rate, n, loop=False):
+    out = np.zeros(n)
+    for onset, voice, pitch, gain in events:
+        buf = gain * generate_sounds.voice_buffer(voice, pitch, rate)
+        start = int(round(onset * rate))
+        for i, v in enumerate(buf):
+            j = start + i
+            if loop:
+                out[j % n] += v
+            elif j < n:
+                out[j] += v
+    return out
+
+
+EVENTS = [(0.0, "chime", 523, 0.5), (0.08, "chime", 659, 0.5), (0.08, "chime", 523, 0.25),
+          (0.3, "sparkle", 2093, 0.1), (0.31, "sparkle", 2093, 0.1), (0.9, "chime", 784, 0.5)]
+
+
+@pytest.mark.parametrize("loop", [False, True])
+def test_sequence_equals_naive_summation(loop):
+    n = int(RATE * 1.0)
+    got = generate_sounds.sequence(EVENTS, RATE, duration=1.0, loop=loop)
+    assert len(got) == n
+    assert np.allclose(got, _naive(EVENTS, RATE, n, loop))
+
+
+def test_sequence_without_duration_keeps_every_tail():
+    got = generate_sounds.sequence(EVENTS, RATE)
+    last = max(int(round(o * RATE)) + len(generate_sounds.voice_buffer(v, p, RATE))
+               for o, v, p, _ in EVENTS)
+    assert len(got) == last
+    assert np.allclose(got, _naive(EVENTS, RATE, last))
+
+
+def test_voice_buffers_are_shared_and_read_only():
+    buf = generate_sounds.voice_buffer("chime", 523, RATE)
+    assert buf is generate_sounds.voice_buffer("chime", 523, RATE)
+    with pytest.raises(ValueError):
+        buf[0] = 1.0
+
+
+def test_sprite_manifest_points_at_each_clip():
+    sink = output_sink.MemorySink()
+    generate_sounds.write_sprite(sink, RATE)
+    meta = json.loads(sink.files["sprite.json"])
+    rate, data = wavfile.read(io.BytesIO(sink.files["sprite.wav"]))
+    assert rate == meta["sampleRate"] == RATE
+    for name, make in generate_sounds.SOUNDS:
+        entry = meta["sounds"][name]
+        clip = generate_sounds.to_pcm16(make(RATE))
+        assert np.array_equal(data[entry["startSample"]:entry["endSample"]], clip)
+        assert entry["start"] == pytest.approx(entry["startSample"] * 1000 / RATE, abs=1e-3)
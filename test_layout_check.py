@@ -0,0 +1,18 @@
+import generate_screenshots
+import layout_check
+
+
+def _avail(element):
+    return next(avail(generate_screenshots.W) for name, _, _, avail in layout_check.SCREEN_ELEMENTS
+                if name == element)
+
+
+def test_button_boxes_match_the_renderer():
+    assert _avail("stamp button") == generate_screenshots.button_text_width(generate_screenshots.STAMP_BUTTON_W)
+    assert _avail("reward button") == generate_screenshots.button_text_width(generate_screenshots.REWARD_BUTTON_W)
+
+
+def test_every_locale_fits_after_auto_fit():
+    _, counts = layout_check.check(None, layout_check.MIN_SIZE)
+    assert counts["clipped"] == 0
+    assert counts["ok"] + counts["overflow"] > 0
@@ -0,0 +1,69 @@
+import io
+import os
+import stat
+import tarfile
+import zipfile
+
+import numpy as np
+import pytest
+from PIL import Image
+from scipy.io import wavfile
+
+import output_sink
+
+FILES = {"icon.png": b"\x89PNG fake", "sounds/tap.wav": b"RIFF fake", "app.json": b"{}"}
+
+
+def _read_back(target):
+    if target.endswith(".zip"):
+        with zipfile.ZipFile(target) as zf:
+            return {name: zf.read(name) for name in zf.namelist()}
+    if target.endswith((".tar", ".tar.gz")):
+        with tarfile.open(target) as tf:
+            return {m.name: tf.extractfile(m).read() for m in tf.getmembers()}
+    return {os.path.relpath(os.path.join(d, f), target).replace(os.sep, "/"):
+            open(os.path.join(d, f), "rb").read()
+            for d, _, names in os.walk(target) for f in names}
+
+
+@pytest.mark.parametrize("suffix", ["out", "out.zip", "out.tar", "out.tar.gz"])
+def test_round_trip(tmp_path, suffix):
+    target = str(tmp_path / suffix)
+    with output_sink.open_sink(target) as sink:
+        for name, data in FILES.items():
+            sink.write(name, data)
+    assert _read_back(target) == FILES
+
+
+def test_memory_sink_round_trip():
+    with output_sink.open_sink(None) as sink:
+        for name, data in FILES.items():
+            sink.write(name, data)
+    assert sink.files == FILES
+
+
+def test_dir_sink_uses_umask_mode_and_leaves_no_temp_files(tmp_path):
+    sink = output_sink.DirSink(str(tmp_path))
+    sink.write("a.png", b"x")
+    sink.write("a.png", b"y")  # replaces in place
+    assert os.listdir(tmp_path) == ["a.png"]
+    assert (tmp_path / "a.png").read_bytes() == b"y"
+    assert stat.S_IMODE(os.stat(tmp_path / "a.png").st_mode) == 0o666 & ~output_sink._read_umask()
+
+
+def test_zip_entries_are_world_readable(tmp_path):
+    target = str(tmp_path / "out.zip")
+    with output_sink.open_sink(target) as sink:
+        sink.write("a.png", b"x")
+    with zipfile.ZipFile(target) as zf:
+        assert stat.S_IMODE(zf.getinfo("a.png").external_attr >> 16) == 0o644
+
+
+def test_encoders_round_trip():
+    img = Image.new("RGBA", (3, 2), (10, 20, 30, 40))
+    sink = output_sink.MemorySink()
+    output_sink.save_image(sink, "a.png", img)
+    output_sink.save_wav(sink, "a.wav", 8000, np.arange(-4, 4, dtype=np.int16))
+    assert Image.open(io.BytesIO(sink.files["a.png"])).tobytes() == img.tobytes()
+    rate, data = wavfile.read(io.BytesIO(sink.files["a.wav"]))
+    assert rate == 8000 and data.tolist() == list(range(-4, 4))
@@ -0,0 +1,33 @@
+import numpy as np
+from PIL import Image
+
+import particles
+
+
+def test_advance_integrates_velocity_and_gravity():
+    p = particles.Particles([0.0], [0.0], 4, vx=10, vy=-5, spin=1.0)
+    particles.advance(p, 0.5, gravity=20)
+    assert p.vy[0] == 5 and p.x[0] == 5 and p.y[0] == 2.5 and p.rotation[0] == 0.5
+
+
+def test_rasterize_returns_a_new_image_with_the_particle_area():
+    img = Image.new("RGBA", (40, 40), (0, 0, 0, 0))
+    p = particles.Particles([20.0], [20.0], 10, 6, color=[(255, 0, 0, 255)])
+    out = particles.rasterize(img, p)
+    assert np.asarray(img).sum() == 0
+    alpha = np.asarray(out)[..., 3].astype(float) / 255
+    assert abs(alpha.sum() - 60) < 1
+
+
+def test_later_particles_draw_on_top():
+    img = Image.new("RGBA", (20, 20), (0, 0, 0, 255))
+    p = particles.Particles([10.0, 10.0], [10.0, 10.0], 8,
+                            color=[(255, 0, 0, 255), (0, 0, 255, 255)])
+    assert np.asarray(particles.rasterize(img, p))[10, 10].tolist() == [0, 0, 255, 255]
+
+
+def test_confetti_is_deterministic_per_seed():
+    a = particles.scatter_confetti(np.random.default_rng(3), 50, (0, 0, 100, 100), ["#FF0000"])
+    b = particles.scatter_confetti(np.random.default_rng(3), 50, (0, 0, 100, 100), ["#FF0000"])
+    assert np.array_equal(a.x, b.x) and np.array_equal(a.rotation, b.rotation)
+    assert ((a.x >= 0) & (a.x <= 100) & (a.y >= 0) & (a.y <= 100)).all()
@@ -0,0 +1,88 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+import render_cache
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(render_cache, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(render_cache, "stats", {"hits": 0, "misses": 0, "evictions": 0})
+    monkeypatch.setattr(render_cache, "_flushed", {"hits": 0, "misses": 0, "evictions": 0})
+    return tmp_path
+
+
+def _lifetime(cache_dir):
+    with open(os.path.join(cache_dir, "stats.json")) as f:
+        return json.load(f)
+
+
+def test_second_lookup_is_a_hit(cache):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return b"payload"
+
+    assert render_cache.cached_bytes("t", (1,), compute) == b"payload"
+    assert render_cache.cached_bytes("t", (1,), compute) == b"payload"
+    assert len(calls) == 1
+    assert render_cache.stats["hits"] == 1 and render_cache.stats["misses"] == 1
+
+
+def test_evicts_least_recently_used(cache, monkeypatch):
+    monkeypatch.setattr(render_cache, "MAX_BYTES", 350)
+    for i, key in enumerate("abc"):
+        render_cache.put(key * 64, b"x" * 100)
+        os.utime(render_cache._path(key * 64), (i, i))
+    render_cache.get("a" * 64)  # refresh the oldest
+    render_cache.put("d" * 64, b"x" * 100)
+    left = sorted(os.path.basename(p)[0] for _, _, p in render_cache._stat_entries())
+    assert left == ["a", "c", "d"]
+    assert render_cache.stats["evictions"] == 1
+
+
+def test_flush_is_incremental(cache):
+    render_cache.get("0" * 64)
+    render_cache.flush_stats()
+    render_cache.flush_stats()  # nothing new
+    render_cache.get("0" * 64)
+    render_cache.flush_stats()
+    assert _lifetime(cache)["misses"] == 2
+
+
+def _worker(args):
+    cache_dir, worker = args
+    render_cache.CACHE_DIR = cache_dir
+    render_cache.MAX_BYTES = 20 * 1024
+    before = dict(render_cache.stats)  # pool processes run several jobs
+    for i in range(60):
+        # Half the keys are shared between workers, half are private
+        key = render_cache.make_key("t", (i % 30, worker if i % 2 else 0))
+        render_cache.cached_bytes("t", (i % 30, worker if i % 2 else 0), lambda: os.urandom(1024))
+        render_cache.get(key)  # may miss: another worker can evict it meanwhile
+    render_cache.flush_stats()
+    return {k: v - before[k] for k, v in render_cache.stats.items()}
+
+
+def test_concurrent_workers_share_the_cache(cache):
+    with ProcessPoolExecutor(4) as pool:
+        per_worker = list(pool.map(_worker, [(str(cache), w) for w in range(8)]))
+    lifetime = _lifetime(cache)
+    for k in ("hits", "misses", "evictions"):
+        assert lifetime[k] == sum(s[k] for s in per_worker)
+    assert lifetime["hits"] + lifetime["misses"] == 8 * 60 * 2
+    # The cap holds across processes without anyone evicting by hand
+    actual = sum(size for _, size, _ in render_cache._stat_entries())
+    assert actual <= 20 * 1024
+    assert render_cache._read_size() == actual
+
+
+def test_counters_are_thread_safe(cache):
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda i: [render_cache.get(f"{i:02d}" + "0" * 62) for _ in range(500)],
+                      range(16)))
+    assert render_cache.stats["misses"] == 16 * 500
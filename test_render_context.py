@@ -0,0 +1,47 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import generate_screenshots
+import render_context
+
+
+def test_contexts_are_per_thread_and_nest():
+    default = render_context.current()
+    with render_context.RenderContext() as outer:
+        assert render_context.current() is outer
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(render_context.current()))
+        thread.start()
+        thread.join()
+        assert seen == [default]  # a new thread does not inherit the context
+        with render_context.RenderContext() as inner:
+            assert render_context.current() is inner
+        assert render_context.current() is outer
+    assert render_context.current() is default
+
+
+def test_fonts_are_loaded_once_per_context():
+    path = generate_screenshots.FONT_PATH
+    a, b = render_context.RenderContext(), render_context.RenderContext()
+    assert a.font(path, 20) is a.font(path, 20)
+    assert a.font(path, 20) is not b.font(path, 20)
+    assert a.chain("sans") is not b.chain("sans")
+
+
+def test_export_is_a_read_only_view():
+    ctx = render_context.RenderContext((5, 3), background=(1, 2, 3, 4))
+    pixels = ctx.export()
+    assert pixels.shape == (3, 5, 4) and not pixels.flags.writeable
+    assert pixels[0, 0].tolist() == [1, 2, 3, 4]
+    assert bytes(ctx.png()[:8]) == b"\x89PNG\r\n\x1a\n"
+
+
+def test_concurrent_renders_match_serial_ones():
+    jobs = [(name, scale) for name, _ in generate_screenshots.SCREENSHOTS[:2] for scale in (1.0, 2.0)]
+    serial = {job: generate_screenshots.render(*job).export() for job in jobs}
+    with ThreadPoolExecutor(4) as pool:
+        futures = {pool.submit(generate_screenshots.render, *job): job for job in jobs * 2}
+        for future, job in futures.items():
+            assert np.array_equal(future.result().export(), serial[job]), job
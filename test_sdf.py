@@ -0,0 +1,45 @@
+import numpy as np
+from PIL import Image
+
+import sdf
+
+
+def _naive_composite(img, flat, rgb, alpha):
+    out = np.asarray(img, dtype=np.float64).reshape(-1, 4).copy()
+    for at, c, a in zip(flat, rgb, alpha):
+        a_dst = out[at, 3] / 255.0 * (1 - a)
+        a_out = a + a_dst
+        out[at, :3] = (c * a + out[at, :3] * a_dst) / max(a_out, 1e-6)
+        out[at, 3] = a_out * 255
+    return np.clip(out + 0.5, 0, 255).astype(np.uint8).reshape(img.height, img.width, 4)
+
+
+def test_composite_blends_every_overlapping_entry():
+    rng = np.random.default_rng(0)
+    img = Image.new("RGBA", (8, 6), (255, 255, 255, 128))
+    flat = rng.integers(0, 48, 300)  # about six entries per pixel
+    rgb = rng.uniform(0, 255, (300, 3))
+    alpha = rng.uniform(0, 1, 300)
+    expected = _naive_composite(img, flat, rgb, alpha)
+    got = np.asarray(sdf.composite(img, flat, rgb, alpha))
+    assert np.abs(got.astype(int) - expected).max() <= 1
+
+
+def test_overlapping_shapes_match_drawing_them_one_by_one():
+    args = dict(fill=["#FF9DD2", "#5BC8F5"], stroke="#333333", stroke_width=2)
+    batched = Image.new("RGBA", (60, 40), (255, 255, 255, 255))
+    sdf.draw_shapes(batched, [22, 36], [20, 20], 12.3, **args)
+    single = Image.new("RGBA", (60, 40), (255, 255, 255, 255))
+    for i, cx in enumerate([22, 36]):
+        sdf.draw_shapes(single, cx, 20, 12.3, fill=args["fill"][i], stroke="#333333",
+                        stroke_width=2)
+    assert np.abs(np.asarray(batched, int) - np.asarray(single, int)).max() <= 1
+
+
+def test_dashed_ring_leaves_gaps():
+    img = Image.new("RGBA", (40, 40), (0, 0, 0, 0))
+    sdf.draw_shapes(img, 20, 20, 15, stroke="#000000", stroke_width=2, dash=(4, 4))
+    ring = np.asarray(img)[..., 3]
+    full = Image.new("RGBA", (40, 40), (0, 0, 0, 0))
+    sdf.draw_shapes(full, 20, 20, 15, stroke="#000000", stroke_width=2)
+    assert 0.3 < ring.sum() / np.asarray(full)[..., 3].sum() < 0.7
@@ -0,0 +1,40 @@
+import numpy as np
+from PIL import Image
+
+import shaders
+
+
+def test_render_only_touches_the_roi():
+    img = Image.new("RGBA", (40, 30), (10, 20, 30, 255))
+    before = np.asarray(img).copy()
+    shaders.render(img, [shaders.glow((20, 15), 6, (255, 255, 0, 200))], roi=(10, 5, 30, 25))
+    after = np.asarray(img)
+    changed = np.argwhere((after != before).any(-1))
+    assert len(changed)
+    assert changed[:, 0].min() >= 5 and changed[:, 0].max() < 25
+    assert changed[:, 1].min() >= 10 and changed[:, 1].max() < 30
+
+
+def test_effects_stack_bottom_to_top():
+    red = shaders.radial_gradient((0, 0), 1, [(0, (255, 0, 0, 255))])
+    blue = shaders.radial_gradient((0, 0), 1, [(0, (0, 0, 255, 255))])
+    img = Image.new("RGBA", (4, 4), (0, 0, 0, 0))
+    shaders.render(img, [red, blue])
+    assert np.asarray(img)[2, 2].tolist() == [0, 0, 255, 255]
+
+
+def test_rays_cover_their_share_of_the_circle():
+    img = Image.new("RGBA", (201, 201), (0, 0, 0, 0))
+    shaders.render(img, [shaders.rays((100.5, 100.5), 12, 10, (255, 255, 255, 255))])
+    alpha = np.asarray(img)[..., 3].astype(float) / 255
+    y, x = np.mgrid[:201, :201]
+    ring = (np.hypot(x + 0.5 - 100.5, y + 0.5 - 100.5) - 70) ** 2 < 400  # r in 50..90
+    assert abs(alpha[ring].mean() - 12 * 10 / 360) < 0.02
+
+
+def test_render_at_2x_matches_1x_geometry():
+    effects = [shaders.vignette((0, 0, 40, 30), strength=0.5)]
+    one = shaders.render(Image.new("RGBA", (40, 30), (255, 255, 255, 255)), effects)
+    two = shaders.render(Image.new("RGBA", (80, 60), (255, 255, 255, 255)), effects, scale=2)
+    down = np.asarray(two, float).reshape(30, 2, 40, 2, 4).mean(axis=(1, 3))
+    assert np.abs(down - np.asarray(one, float)).max() <= 3
@@ -0,0 +1,62 @@
+import numpy as np
+from scipy.io import wavfile
+
+import generate_sounds
+import wav_post
+
+RATE = 8000
+
+
+def _write(path, samples, rate=RATE):
+    wavfile.write(path, rate, samples)
+    return str(path)
+
+
+def test_trim_keeps_the_loud_part_plus_the_fades(tmp_path):
+    tone = np.where(np.arange(2000) % 20 < 10, 16000, -16000).astype(np.int16)
+    path = _write(tmp_path / "a.wav", np.concatenate([np.zeros(1000, np.int16), tone,
+                                                      np.zeros(3000, np.int16)]))
+    plan = wav_post.process([path], fade_in_ms=2, fade_out_ms=10, target=-20)
+    rate, data = wavfile.read(path)
+    fade_in, fade_out = RATE * 2 // 1000, RATE * 10 // 1000
+    assert rate == RATE
+    assert plan[0]["start"] == 1000 - fade_in
+    assert len(data) == 2000 + fade_in + fade_out
+    # The padded edges ramp from silence, the tone itself starts at full gain
+    assert data[0] == 0 and data[-1] == 0
+    assert abs(int(data[fade_in + 5])) > 0
+
+
+def test_measure_is_unchanged_by_the_trim(tmp_path):
+    tone = (np.sin(np.arange(4000) * 0.2) * 8000).astype(np.int16)
+    path = _write(tmp_path / "a.wav", np.concatenate([np.zeros(500, np.int16), tone]))
+    before = wav_post.process([path], dry_run=True)[0]["level"]
+    wav_post.process([path], target=before)
+    rate, data, _ = wav_post._open(path)
+    after, _ = wav_post.measure(data, 0, len(data), rate)
+    assert abs(after - before) < 0.2
+
+
+def test_default_threshold_trims_silence_but_not_quiet_tails(tmp_path):
+    t = np.arange(4000) / RATE
+    decay = (np.sin(2 * np.pi * 440 * t) * np.exp(-t * 8) * 20000).astype(np.int16)
+    # Still ringing at about -40 dBFS where the padding starts
+    path = _write(tmp_path / "a.wav", np.concatenate([np.zeros(800, np.int16), decay,
+                                                      np.zeros(2400, np.int16)]))
+    plan = wav_post.process([path], fade_in_ms=2, fade_out_ms=10, target=-20)[0]
+    kept = plan["stop"] - plan["start"]
+    assert kept < 800 + 4000 + 2400
+    assert plan["start"] >= 800 - RATE * 2 // 1000 - 1
+    assert plan["stop"] >= 800 + 4000 - 50  # the quiet tail survives
+
+
+def test_loudness_matching_equalizes_the_set(tmp_path):
+    t = np.arange(RATE) / RATE
+    loud = _write(tmp_path / "loud.wav", (np.sin(2 * np.pi * 440 * t) * 20000).astype(np.int16))
+    quiet = _write(tmp_path / "quiet.wav", (np.sin(2 * np.pi * 440 * t) * 2000).astype(np.int16))
+    wav_post.process([loud, quiet], threshold_db=-90, ceiling_db=0)
+    levels = []
+    for path in (loud, quiet):
+        rate, data, _ = wav_post._open(path)
+        levels.append(wav_post.measure(data, 0, len(data), rate)[0])
+    assert abs(levels[0] - levels[1]) < 0.2
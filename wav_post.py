@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+In-place WAV post-processing: silence trim, anti-click fades and loudness
+matching across a set of sounds.
+
+Files are opened memory-mapped (scipy.io.wavfile.read(mmap=True) to parse the
+header, np.memmap in r+ mode to write) and walked in fixed-size chunks, so a
+batch of long recordings never has to fit in memory. For every file:
+  - leading and trailing frames quieter than --threshold dBFS are trimmed
+    (the data is shifted down in place and the file truncated). The default
+    is a silence floor: it removes padding and inaudible tails, never a
+    decay that can still be heard
+  - short linear fades go on both ends so the new edges never click (they
+    cover the quiet frames just outside the trimmed range)
+  - one gain brings it to the loudness shared by the whole set
+
+Loudness is either RMS or a K-weighted (BS.1770) mean square in LUFS. It is
+ungated, because UI sounds are shorter than the standard's 400 ms gating
+block. The shared target defaults to the set's mean loudness and is lowered
+when a file would otherwise peak above --ceiling.
+
+Run it on the individual clips, not on a --sprite build; the sprite's gaps
+are intentional silence.
+
+Usage: python3 wav_post.py [assets/sounds | a.wav b.wav ...] [--threshold -60]
+                           [--fade-in-ms 2] [--fade-out-ms 10] [--loudness lufs|rms]
+                           [--target DB] [--ceiling -1] [--dry-run]
+Output: the WAV files rewritten in place.
+"""
+
+import argparse
+import glob
+import math
+import os
+import struct
+
+import numpy as np
+from scipy import signal
+from scipy.io import wavfile
+
+import generate_sounds
+
+CHUNK = 1 << 16  # frames per chunk
+
+
+def _open(path):
+    """(rate, read-only frames × channels memmap, data offset in bytes)."""
+    rate, data = wavfile.read(path, mmap=True)
+    if data.dtype.kind not in "if" or data.dtype == np.uint8:
+        raise ValueError(f"{path}: unsupported sample format {data.dtype}")
+    return rate, data.reshape(len(data), -1), data.offset
+
+
+def _full_scale(dtype):
+    return 1.0 if dtype.kind == "f" else float(np.iinfo(dtype).max) + 1
+
+
+def _chunks(start, stop, reverse=False):
+    starts = range(start, stop, CHUNK)
+    for lo in reversed(starts) if reverse else starts:
+        yield lo, min(lo + CHUNK, stop)
+
+
+def _loud(data, lo, hi, threshold):
+    """Indices (relative to lo) of frames in lo..hi with any channel above `threshold`."""
+    return np.flatnonzero(np.abs(data[lo:hi].astype(np.float32)).max(axis=1) > threshold)
+
+
+def find_bounds(data, threshold):
+    """[start, stop) frames spanning every sample louder than `threshold`; (0, 0) if none."""
+    for lo, hi in _chunks(0, len(data)):
+        hot = _loud(data, lo, hi, threshold)
+        if len(hot):
+            start = lo + int(hot[0])
+            break
+    else:
+        return 0, 0
+    for lo, hi in _chunks(start, len(data), reverse=True):
+        hot = _loud(data, lo, hi, threshold)
+        if len(hot):
+            return start, lo + int(hot[-1]) + 1
+
+
+# ── Loudness ──
+
+def k_weighting(rate):
+    """Second-order sections of the BS.1770 K-weighting filter at `rate`.
+
+    Bilinear-transform derivation; reproduces the standard's 48 kHz table.
+    """
+    # Stage 1: high shelf, +4 dB above ~1.7 kHz (acoustic effect of the head)
+    K = math.tan(math.pi * 1681.974450955533 / rate)
+    Q = 0.7071752369554196
+    Vh = 10 ** (3.999843853973347 / 20)
+    Vb = Vh ** 0.4996667741545416
+    a0 = 1 + K / Q + K * K
+    shelf = [(Vh + Vb * K / Q + K * K) / a0, 2 * (K * K - Vh) / a0, (Vh - Vb * K / Q + K * K) / a0,
+             1.0, 2 * (K * K - 1) / a0, (1 - K / Q + K * K) / a0]
+    # Stage 2: RLB high-pass at ~38 Hz
+    K = math.tan(math.pi * 38.13547087602444 / rate)
+    Q = 0.5003270373238773
+    a0 = 1 + K / Q + K * K
+    highpass = [1.0, -2.0, 1.0, 1.0, 2 * (K * K - 1) / a0, (1 - K / Q + K * K) / a0]
+    return np.array([shelf, highpass])
+
+
+def measure(data, start, stop, rate, loudness="lufs"):
+    """(loudness in dB, peak as a fraction of full scale) of frames start..stop."""
+    scale = _full_scale(data.dtype)
+    channels = data.shape[1]
+    total, peak = np.zeros(channels), 0.0
+    if loudness == "lufs":
+        sos = k_weighting(rate)
+        zi = np.zeros((len(sos), 2, channels))
+    for lo, hi in _chunks(start, stop):
+        x = data[lo:hi].astype(np.float64) / scale
+        peak = max(peak, float(np.abs(x).max()))
+        if loudness == "lufs":
+            x, zi = signal.sosfilt(sos, x, axis=0, zi=zi)
+        total += np.einsum("ij,ij->j", x, x)
+    power = total / max(stop - start, 1)
+    power = power.sum() if loudness == "lufs" else power.mean()
+    if power <= 0:
+        return -math.inf, peak
+    return (-0.691 if loudness == "lufs" else 0.0) + 10 * math.log10(power), peak
+
+
+# ── Rewrite ──
+
+def apply(path, start, stop, gain, fade_in, fade_out):
+    """Keep frames start..stop scaled by `gain` with linear fades (in frames), in place."""
+    _, ro, offset = _open(path)
+    frames, channels, dtype = ro.shape[0], ro.shape[1], ro.dtype
+    del ro
+    data = np.memmap(path, dtype=dtype, mode="r+", offset=offset, shape=(frames, channels))
+    n = stop - start
+    limits = np.iinfo(dtype) if dtype.kind == "i" else None
+    # Chunks run forward and each is read before it is written, so shifting
+    # down by `start` never overwrites frames that are still to be read
+    for lo, hi in _chunks(0, n):
+        x = data[start + lo:start + hi].astype(np.float64)
+        i = np.arange(lo, hi)
+        env = gain * np.minimum(1.0, np.minimum((i + 1) / (fade_in + 1), (n - i) / (fade_out + 1)))
+        x *= env[:, None]
+        if limits is not None:
+            x = np.clip(np.round(x), limits.min, limits.max)
+        data[lo:hi] = x.astype(dtype)
+    data.flush()
+    del data
+
+    if n != frames:
+        size = offset + n * channels * dtype.itemsize
+        with open(path, "r+b") as f:
+            f.seek(offset - 8)
+            if f.read(4) != b"data":
+                raise ValueError(f"{path}: unexpected chunk layout")
+            f.write(struct.pack("<I", n * channels * dtype.itemsize))
+            f.seek(4)
+            f.write(struct.pack("<I", size - 8))
+            f.truncate(size)
+
+
+def process(paths, threshold_db=-60.0, fade_in_ms=2.0, fade_out_ms=10.0, loudness="lufs",
+            target=None, ceiling_db=-1.0, dry_run=False):
+    """Trim, fade and loudness-match `paths` in place; returns one dict per file."""
+    plan = []
+    for path in paths:
+        rate, data, offset = _open(path)
+        frames = len(data)
+        fade_in, fade_out = int(rate * fade_in_ms / 1000), int(rate * fade_out_ms / 1000)
+        start, stop = find_bounds(data, 10 ** (threshold_db / 20) * _full_scale(data.dtype))
+        if stop == start:
+            start, stop = 0, frames
+        # Fades run over the quiet frames just outside the kept range, not into it
+        start, stop = max(0, start - fade_in), min(frames, stop + fade_out)
+        # Only trim when the data chunk ends the file; otherwise truncating
+        # would cut off whatever chunks follow it
+        end = offset + data.nbytes
+        if end + (end & 1) < os.path.getsize(path):
+            start, stop = 0, frames
+        level, peak = measure(data, start, stop, rate, loudness)
+        del data
+        plan.append({"path": path, "rate": rate, "frames": frames, "start": start, "stop": stop,
+                     "fade_in": fade_in, "fade_out": fade_out, "level": level, "peak": peak})
+
+    measured = [p for p in plan if math.isfinite(p["level"])]
+    if not measured:
+        return plan
+    goal = target if target is not None else sum(p["level"] for p in measured) / len(measured)
+    # Lower the shared target until no file would peak above the ceiling
+    goal = min([goal] + [p["level"] + ceiling_db - 20 * math.log10(p["peak"]) for p in measured])
+
+    for p in plan:
+        p["gain_db"] = goal - p["level"] if math.isfinite(p["level"]) else 0.0
+        p["goal"] = goal
+        if not dry_run:
+            apply(p["path"], p["start"], p["stop"], 10 ** (p["gain_db"] / 20), p["fade_in"], p["fade_out"])
+    return plan
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trim, fade and loudness-match WAV files in place")
+    parser.add_argument("paths", nargs="*", default=[generate_sounds.SOUNDS_DIR],
+                        help="WAV files or directories of them")
+    parser.add_argument("--threshold", type=float, default=-60.0,
+                        help="trim frames quieter than this (dBFS) at either end")
+    parser.add_argument("--fade-in-ms", type=float, default=2.0)
+    parser.add_argument("--fade-out-ms", type=float, default=10.0)
+    parser.add_argument("--loudness", choices=["lufs", "rms"], default="lufs")
+    parser.add_argument("--target", type=float, help="loudness target (default: mean of the set)")
+    parser.add_argument("--ceiling", type=float, default=-1.0, help="peak ceiling in dBFS")
+    parser.add_argument("--dry-run", action="store_true", help="report without rewriting")
+    args = parser.parse_args()
+
+    paths = []
+    for path in args.paths:
+        paths += sorted(glob.glob(os.path.join(path, "*.wav"))) if os.path.isdir(path) else [path]
+    plan = process(paths, args.threshold, args.fade_in_ms, args.fade_out_ms, args.loudness,
+                   args.target, args.ceiling, args.dry_run)
+
+    unit = "LUFS" if args.loudness == "lufs" else "dBFS"
+    for p in plan:
+        before = p["frames"] / p["rate"]
+        after = (p["stop"] - p["start"]) / p["rate"]
+        print(f"{os.path.basename(p['path'])}: {before:.3f}s -> {after:.3f}s, "
+              f"{p['level']:.1f} {unit} {p.get('gain_db', 0.0):+.1f} dB")
+    if plan and "goal" in plan[0]:
+        print(f"Matched {len(plan)} files to {plan[0]['goal']:.1f} {unit}"
+              + (" (dry run)" if args.dry_run else ""))
+
+
+if __name__ == "__main__":
+    main()